@@ -1,18 +1,60 @@
 import streamlit as st
-from utils.job_scraper import JobScraper
-from utils.email_generator import EmailGenerator
 import os
+import time
 from dotenv import load_dotenv
-import PyPDF2
 import io
 
 # Load environment variables
 load_dotenv()
 
 
-# Initialize components
-scraper = JobScraper()
-email_generator = EmailGenerator()
+# Initialize components once per server process; Streamlit reruns reuse them.
+# Heavy modules (selenium, spaCy, langchain, PyPDF2) are imported on first real use.
+# The factories in utils.pipeline are shared with the task worker processes.
+@st.cache_resource(show_spinner=False)
+def get_scraper():
+    from utils.pipeline import build_scraper
+    return build_scraper()
+
+
+@st.cache_resource(show_spinner=False)
+def get_listing_crawler():
+    from utils.pipeline import build_listing_crawler
+    return build_listing_crawler(get_scraper())
+
+
+@st.cache_resource(show_spinner=False)
+def get_email_generator():
+    from utils.pipeline import build_email_generator
+    return build_email_generator()
+
+
+@st.cache_resource(show_spinner=False)
+def get_resume_ingestor():
+    from utils.pipeline import build_resume_ingestor
+    return build_resume_ingestor()
+
+
+@st.cache_resource(show_spinner=False)
+def get_task_queue():
+    """
+    Scans and generation run as background tasks shared by all sessions; the page
+    polls them. JOBFOLIO_TASK_BACKEND=process runs them in worker processes instead of threads.
+    """
+    from utils.task_queue import ProcessBackend, TaskQueue, ThreadBackend
+
+    if os.getenv("JOBFOLIO_TASK_BACKEND") == "process":
+        return TaskQueue(ProcessBackend())
+    return TaskQueue(ThreadBackend(max_workers=int(os.getenv("JOBFOLIO_TASK_WORKERS", "4"))))
+
+
+def get_components():
+    """The app's cached objects for thread workers; worker processes build their own"""
+    if os.getenv("JOBFOLIO_TASK_BACKEND") == "process":
+        return None
+    from utils.pipeline import Components
+    return Components(get_scraper(), get_email_generator(), get_resume_ingestor(), get_listing_crawler())
+
 
 # Custom CSS for modern and colorful UI with Dark Mode support
 st.set_page_config(
@@ -212,13 +254,93 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 
-def extract_text_from_pdf(pdf_file):
-    """Extract text content from uploaded PDF file"""
-    pdf_reader = PyPDF2.PdfReader(pdf_file)
-    text = ""
-    for page in pdf_reader.pages:
-        text += page.extract_text()
-    return text
+def show_task_progress(task):
+    """Render a running task's progress: stage, scan counts, best match so far and the email being written"""
+    progress = task['progress']
+    stage = progress.get('stage')
+    if stage in (None, 'resume'):
+        st.markdown("Reading your resume...")
+    elif stage == 'links':
+        st.markdown("Collecting job links from the listing...")
+    else:
+        status = f"Scanned {progress.get('fetched', 0)}/{progress.get('total', 0)} postings"
+        best = progress.get('best')
+        if best:
+            status += f" · best match so far: **{best['title']}** at {best['company']}"
+        st.markdown(status)
+    if progress.get('partial_email'):
+        st.subheader("Generated Email")
+        st.markdown(progress['partial_email'])
+    for result in progress.get('emails', []):
+        st.markdown(f"✅ Email ready for **{result['job']['title']}** at {result['job']['company']}")
+
+
+def show_timing_panel(result):
+    """Debug panel: per-stage timings of the last run and the trace/metrics exports"""
+    import json
+    from utils.tracing import TRACER, stage_summary
+
+    trace = result.get('trace')
+    if not trace:
+        return
+    with st.expander(f"⏱️ Timing breakdown ({trace['duration_ms'] / 1000:.2f}s total)", expanded=True):
+        st.dataframe(stage_summary(trace), use_container_width=True)
+        col_trace, col_metrics = st.columns(2)
+        col_trace.download_button("Download trace (JSON)", json.dumps(trace, indent=2, ensure_ascii=False),
+                                  file_name=f"trace-{trace['trace_id']}.json", mime="application/json")
+        # With the process backend each worker keeps its own metrics; this is the server process's view
+        col_metrics.download_button("Download metrics (Prometheus)", TRACER.export_prometheus(),
+                                    file_name="jobfolio-metrics.prom", mime="text/plain")
+
+
+def show_prompt_metrics(email):
+    metrics = email.get('prompt_metrics')
+    if metrics:
+        st.caption(f"Prompt: {metrics['prompt_tokens']} tokens ({metrics['tokens_saved']} saved by compaction)")
+
+
+def show_task_result(result):
+    if result.get('message'):
+        st.error(result['message'])
+        return
+
+    emails = result['emails']
+    if len(emails) > 1:
+        st.subheader("Generated Emails")
+        # Emails arrive sorted by their job's match rank
+        for email in emails:
+            job = email['job']
+            st.markdown(f"**#{email['rank'] + 1} [{job['title']}]({job['url']})** at {job['company']}")
+            if email['error'] is not None:
+                st.error(f"Could not generate this email: {email['error']}")
+                continue
+            st.text_area("Email Content", email['email'], height=300, key=f"email_{email['rank']}")
+            show_prompt_metrics(email)
+    else:
+        best_job = emails[0]['job']
+        st.subheader("Generated Email")
+        st.text_area("Email Content", emails[0]['email'], height=300)
+        show_prompt_metrics(emails[0])
+        st.markdown(f"**Best Matching Job:** [{best_job['title']}]({best_job['url']}) at {best_job['company']}")
+
+    # Success Tips
+    st.markdown("""
+        ### 🎯 Next Steps
+        1. **Review and Customize**
+           - Personalize the generated email
+           - Add specific company details
+           - Adjust tone if needed
+
+        2. **Before Sending**
+           - Proofread carefully
+           - Check all links
+           - Verify contact information
+
+        3. **After Sending**
+           - Set a follow-up reminder
+           - Track the response
+           - Update your records
+    """)
 
 def main():
     st.title("Smart Email Generator For Job Seekers")
@@ -251,6 +373,11 @@ def main():
     # Step 1: Get listing page URL
     listing_url = st.text_input("Enter the job listing page URL (not individual job):")
 
+    follow_pagination = st.checkbox(
+        "Follow pagination",
+        help="Also collect postings from the listing's next pages (up to 20 pages, fetched politely)"
+    )
+
     # Step 2: Upload resume
     uploaded_file = st.file_uploader("Upload your resume (PDF)", type=['pdf'])
 
@@ -321,60 +448,62 @@ def main():
                - Network growth
         """)
 
+    # Step 4: How many of the best matching jobs to write emails for
+    email_count = st.slider(
+        "Number of emails",
+        min_value=1, max_value=5, value=1,
+        help="Write emails for the top matching jobs at once; they are generated concurrently"
+    )
+
+    # JOBFOLIO_TRACING=1 records per-stage spans; the panel shows them for the last run
+    from utils.tracing import TRACER
+    show_timings = TRACER.enabled and st.checkbox("Show timing breakdown (debug)")
+
     if listing_url and uploaded_file:
-        if st.button("Generate Email for Best Matching Job"):
-            try:
+        col_generate, col_regenerate = st.columns(2)
+        generate_clicked = col_generate.button("Generate Email for Best Matching Job")
+        regenerate_clicked = col_regenerate.button(
+            "Regenerate Email",
+            help="Ask the model for a fresh email instead of reusing the last one generated for this job"
+        )
+        if generate_clicked or regenerate_clicked:
+            from utils.pipeline import run_email_pipeline
+
+            task_queue = get_task_queue()
+            # A new request replaces this session's previous one
+            if st.session_state.get("task_id"):
+                task_queue.cancel(st.session_state["task_id"])
+            st.session_state["task_id"] = task_queue.submit(
+                run_email_pipeline,
+                listing_url, uploaded_file.getvalue(), tone.lower(),
+                email_count=email_count,
+                follow_pagination=follow_pagination,
+                regenerate=regenerate_clicked,
+                components=get_components()
+            )
+
+        task_id = st.session_state.get("task_id")
+        if task_id:
+            task_queue = get_task_queue()
+            task = task_queue.status(task_id)
+            if task is None:
+                # Result expired
+                del st.session_state["task_id"]
+            elif task['status'] in ('pending', 'running'):
                 with st.spinner("Scanning listings and generating email..."):
-                    # Extract resume text
-                    resume_text = extract_text_from_pdf(uploaded_file)
-
-                    # Extract job links from the page
-                    job_links = scraper.extract_job_links(listing_url)
-
-                    if not job_links:
-                        st.error("No job links found on the page. Please try a different listing URL.")
-                        return
-
-                    # Find best match
-                    best_job = scraper.find_best_matching_job(job_links, resume_text)
-
-                    if not best_job:
-                        st.error("Could not find a matching job based on your resume.")
-                        return
-
-                    
-                    email_content = email_generator.generate_email(
-                        job_details=best_job,
-                        resume_text=resume_text,
-                        tone=tone.lower()
-                    )
-
-                    # Display result
-                    st.subheader("Generated Email")
-                    st.text_area("Email Content", email_content, height=300)
-                    st.markdown(f"**Best Matching Job:** [{best_job['title']}]({best_job['url']}) at {best_job['company']}")
-
-                    # Success Tips
-                    st.markdown("""
-                        ### 🎯 Next Steps
-                        1. **Review and Customize**
-                           - Personalize the generated email
-                           - Add specific company details
-                           - Adjust tone if needed
-
-                        2. **Before Sending**
-                           - Proofread carefully
-                           - Check all links
-                           - Verify contact information
-
-                        3. **After Sending**
-                           - Set a follow-up reminder
-                           - Track the response
-                           - Update your records
-                    """)
-
-            except Exception as e:
-                st.error(f"An error occurred: {str(e)}")
+                    show_task_progress(task)
+                    if st.button("Cancel"):
+                        task_queue.cancel(task_id)
+                    time.sleep(0.5)
+                st.rerun()
+            elif task['status'] == 'failed':
+                st.error(f"An error occurred: {str(task['error'])}")
+            elif task['status'] == 'cancelled':
+                st.info("The request was cancelled.")
+            else:
+                show_task_result(task['result'])
+                if show_timings:
+                    show_timing_panel(task['result'])
     else:
         st.info("Please enter a job listing URL and upload your resume.")
 
@@ -0,0 +1,89 @@
+"""
+Local careers site for trying the pagination crawler: a listing spread over
+numbered ?page= pages linked with rel=next and page numbers, a final
+"Load more" button backed by a fragment endpoint, posting detail pages, and a
+robots.txt that disallows one page and sets a crawl delay.
+
+    python benchmarks/listing_fixture_server.py --port 8766 --pages 6 --per-page 5
+    # then paste http://127.0.0.1:8766/careers?page=1 into the app with pagination enabled
+"""
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SKILLS = ['Python', 'Django', 'PostgreSQL', 'AWS', 'Docker', 'Kubernetes', 'React', 'TypeScript']
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    pages = 6
+    per_page = 5
+    disallowed_page = 4
+    crawl_delay = 1
+
+    def do_GET(self):
+        parts = urlparse(self.path)
+        query = parse_qs(parts.query)
+
+        if parts.path == '/robots.txt':
+            self._reply(f"User-agent: *\nDisallow: /careers?page={self.disallowed_page}\n"
+                        f"Crawl-delay: {self.crawl_delay}\n", 'text/plain')
+        elif parts.path == '/careers':
+            self._reply(self._listing_page(int(query.get('page', ['1'])[0])))
+        elif parts.path == '/careers/more':
+            offset = int(query.get('offset', ['0'])[0])
+            self._reply(self._job_anchors(offset, offset + self.per_page))
+        elif parts.path.startswith('/job/'):
+            self._reply(self._job_page(int(parts.path.rsplit('/', 1)[1])))
+        else:
+            self._reply('<h1>Not found</h1>', status=404)
+
+    def _listing_page(self, page):
+        start = (page - 1) * self.per_page
+        body = [f"<h1>Careers - page {page}</h1>", self._job_anchors(start, start + self.per_page), '<nav>']
+        if page < self.pages:
+            body.insert(0, f'<link rel="next" href="/careers?page={page + 1}">')
+            body.append(f'<a href="/careers?page={page + 1}" aria-label="Next page">›</a>')
+        else:
+            body.append(f'<button data-url="/careers/more?offset={page * self.per_page}">Load more</button>')
+        body.extend(f'<a href="/careers?page={number}">{number}</a>' for number in range(1, self.pages + 1))
+        body.append('</nav>')
+        return "<html><body>" + "\n".join(body) + "</body></html>"
+
+    @staticmethod
+    def _job_anchors(start, end):
+        return "\n".join(f'<a href="/job/{number}">Software Engineer {number}</a>' for number in range(start, end))
+
+    @staticmethod
+    def _job_page(number):
+        skills = "".join(f"<li>{SKILLS[(number + i) % len(SKILLS)]}</li>" for i in range(3))
+        return (f"<html><body><h1>Software Engineer {number}</h1><div class='company'>Fixture Inc</div>"
+                f"<div class='location'>Remote</div><ul>{skills}</ul></body></html>")
+
+    def _reply(self, text, content_type='text/html', status=200):
+        data = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        print(f"fixture: {format % args}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--pages', type=int, default=6)
+    parser.add_argument('--per-page', type=int, default=5)
+    args = parser.parse_args()
+
+    FixtureHandler.pages = args.pages
+    FixtureHandler.per_page = args.per_page
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), FixtureHandler)
+    print(f"Fixture careers site on http://127.0.0.1:{args.port}/careers?page=1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
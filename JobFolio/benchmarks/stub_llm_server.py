@@ -0,0 +1,121 @@
+"""
+Local stand-in for the Groq chat completions endpoint, for trying concurrent
+email generation without an API key or quota. Every Nth request is answered
+with 429 and a Retry-After header so the backoff path is exercised too.
+Requests with "stream": true are answered as server-sent events
+(chat.completion.chunk deltas ending with [DONE]), so the streaming
+single-email path can run against it as well.
+
+    python benchmarks/stub_llm_server.py --port 8765 --latency 1.5 --rate-limit-every 4
+    GROQ_BASE_URL=http://127.0.0.1:8765 GROQ_API_KEY=stub streamlit run app.py
+"""
+import argparse
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EMAIL = """Subject: Application for the {title} role
+
+Dear Hiring Manager,
+
+I am writing to apply for the open position. My background matches the skills you list.
+
+Sincerely,
+Stub Model"""
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    counter = itertools.count(1)
+    lock = threading.Lock()
+    latency = 1.0
+    rate_limit_every = 0
+    retry_after = 1
+    chunk_words = 3
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        with self.lock:
+            number = next(self.counter)
+
+        if self.rate_limit_every and number % self.rate_limit_every == 0:
+            self._reply(429, {'error': {'message': 'Rate limit reached', 'type': 'rate_limit_exceeded'}},
+                        {'Retry-After': str(self.retry_after)})
+            return
+
+        time.sleep(self.latency)
+        prompt = body.get('messages', [{}])[-1].get('content', '')
+        title = next((line.split(':', 1)[1].strip() for line in prompt.splitlines()
+                      if line.strip().startswith('Job Title:')), 'advertised')
+        if body.get('stream'):
+            self._stream(number, body.get('model', 'stub'), EMAIL.format(title=title))
+            return
+        self._reply(200, {
+            'id': f'stub-{number}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'stub'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': EMAIL.format(title=title)},
+                'finish_reason': 'stop'
+            }],
+            'usage': {'prompt_tokens': len(prompt) // 4, 'completion_tokens': 60,
+                      'total_tokens': len(prompt) // 4 + 60}
+        })
+
+    def _stream(self, number, model, content):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        words = content.split(' ')
+        pieces = [' '.join(words[i:i + self.chunk_words]) + ' ' for i in range(0, len(words), self.chunk_words)]
+        pieces[-1] = pieces[-1][:-1]
+        deltas = [{'role': 'assistant', 'content': ''}] + [{'content': piece} for piece in pieces] + [{}]
+        for index, delta in enumerate(deltas):
+            event = {
+                'id': f'stub-{number}',
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{'index': 0, 'delta': delta,
+                             'finish_reason': 'stop' if index == len(deltas) - 1 else None}]
+            }
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _reply(self, status, payload, headers=None):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        print(f"stub: {format % args}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=1.0, help='seconds per completion')
+    parser.add_argument('--rate-limit-every', type=int, default=0, help='answer every Nth request with 429')
+    args = parser.parse_args()
+
+    StubHandler.latency = args.latency
+    StubHandler.rate_limit_every = args.rate_limit_every
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), StubHandler)
+    print(f"Stub LLM listening on http://127.0.0.1:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
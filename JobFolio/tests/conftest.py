@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules import each other as `utils.x`, relative to the JobFolio directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,135 @@
+import threading
+from http.server import ThreadingHTTPServer
+from urllib.parse import urljoin
+from urllib.request import urlopen
+
+import pytest
+from bs4 import BeautifulSoup
+
+pytest.importorskip("selenium")
+
+from benchmarks.listing_fixture_server import FixtureHandler
+from utils.browser_pool import COLLECT_LINKS_SCRIPT, PAGE_STATE_SCRIPT, BrowserPool, collect_rendered_links
+
+
+class FakeDriver:
+    instances = 0
+
+    def __init__(self):
+        FakeDriver.instances += 1
+        self.number = FakeDriver.instances
+        self.quit_calls = 0
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+class StaticPageDriver(FakeDriver):
+    """Stands in for headless Chrome: loads pages over HTTP and answers the pool's scripts from the HTML"""
+
+    def get(self, url):
+        self.url = url
+        with urlopen(url, timeout=10) as response:
+            self.soup = BeautifulSoup(response.read().decode('utf-8'), 'html.parser')
+
+    def execute_script(self, script):
+        anchors = self.soup.find_all('a', href=True)
+        if script == PAGE_STATE_SCRIPT:
+            return ['complete', len(anchors), 1, 1000]
+        if script == COLLECT_LINKS_SCRIPT:
+            return [[urljoin(self.url, a['href']), a.get_text(strip=True)] for a in anchors]
+        return None
+
+
+class RecordingFactory:
+    """driver_factory that remembers every driver it created"""
+
+    def __init__(self):
+        self.created = []
+
+    def __call__(self):
+        driver = FakeDriver()
+        self.created.append(driver)
+        return driver
+
+
+@pytest.fixture
+def fixture_site():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_lease_reuses_a_warm_driver():
+    factory = RecordingFactory()
+    created = factory.created
+    pool = BrowserPool(size=1, max_uses=5, driver_factory=factory)
+
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+
+    assert first is second
+    assert len(created) == 1
+    assert first.quit_calls == 0
+
+
+def test_driver_is_recycled_after_max_uses():
+    factory = RecordingFactory()
+    created = factory.created
+    pool = BrowserPool(size=1, max_uses=2, driver_factory=factory)
+
+    leased = []
+    for _ in range(5):
+        with pool.lease() as driver:
+            leased.append(driver)
+
+    assert [driver.number for driver in leased] == [created[0].number] * 2 + [created[1].number] * 2 + \
+        [created[2].number]
+    assert created[0].quit_calls == 1 and created[1].quit_calls == 1
+    assert created[2].quit_calls == 0
+
+
+def test_driver_is_discarded_after_an_error():
+    factory = RecordingFactory()
+    created = factory.created
+    pool = BrowserPool(size=1, max_uses=10, driver_factory=factory)
+
+    with pytest.raises(RuntimeError):
+        with pool.lease() as broken:
+            raise RuntimeError("renderer crashed")
+    with pool.lease() as replacement:
+        pass
+
+    assert broken.quit_calls == 1
+    assert replacement is not broken
+    # The failed lease gave its slot back, so a size-1 pool can still lease
+    assert len(created) == 2
+
+
+def test_close_quits_idle_drivers_and_rejects_new_leases():
+    pool = BrowserPool(size=2, driver_factory=FakeDriver)
+    with pool.lease() as driver:
+        pass
+
+    pool.close()
+
+    assert driver.quit_calls == 1
+    with pytest.raises(RuntimeError):
+        with pool.lease():
+            pass
+
+
+def test_collect_rendered_links_from_fixture_site(fixture_site):
+    pool = BrowserPool(size=1, driver_factory=StaticPageDriver)
+
+    with pool.lease() as driver:
+        links = collect_rendered_links(driver, f"{fixture_site}/careers?page=1", max_scrolls=1, timeout=5)
+
+    job_links = [(href, text) for href, text in links if '/job/' in href]
+    assert job_links == [(f"{fixture_site}/job/{number}", f"Software Engineer {number}") for number in range(5)]
+    assert any(href.endswith('/careers?page=2') for href, _ in links)
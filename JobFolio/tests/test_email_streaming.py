@@ -0,0 +1,149 @@
+import pytest
+
+from utils.email_generator import EmailGenerator, SignOffTrimmer
+from utils.rate_limiter import RateLimiter
+from utils.resume_profile import ResumeProfile
+
+COMPLETION = (
+    "\n  Subject: Application for Backend Engineer\n\n"
+    "Dear Hiring Manager,\n\n"
+    "I am excited to apply for the Backend Engineer role at Acme. I have built Python services "
+    "on AWS and enjoy working on reliable APIs.\n\n"
+    "Sincerely,\n"
+    "[Your Name]\n"
+)
+
+JOB = {
+    'title': 'Backend Engineer',
+    'company': 'Acme',
+    'primary_skills': ['Python', 'AWS'],
+    'experience': '3+ years',
+}
+
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeStreamingLLM:
+    """Returns a fixed completion, whole from invoke() and in fixed-size chunks from stream()"""
+
+    def __init__(self, text, chunk_size):
+        self.text = text
+        self.chunk_size = chunk_size
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return FakeMessage(self.text)
+
+    async def ainvoke(self, prompt):
+        return self.invoke(prompt)
+
+    def stream(self, prompt):
+        self.prompts.append(prompt)
+        for start in range(0, len(self.text), self.chunk_size):
+            yield FakeMessage(self.text[start:start + self.chunk_size])
+
+
+def make_profile():
+    # Contact details are given, so no spaCy model is needed
+    return ResumeProfile(
+        "Jane Doe\njane@example.com\nSkills\nPython, AWS, Docker\n",
+        contact_details={'name': 'Jane Doe', 'phone': '+1 555 0100', 'email': 'jane@example.com',
+                         'linkedin': None, 'location': None, 'portfolio': None}
+    )
+
+
+def sincerely_split_sizes():
+    """Chunk sizes for which some chunk boundary falls inside the word "sincerely" """
+    start = COMPLETION.index("Sincerely")
+    return [size for size in range(1, 40)
+            if any(start < boundary < start + len("sincerely") for boundary in range(size, len(COMPLETION), size))]
+
+
+@pytest.mark.parametrize('chunk_size', sincerely_split_sizes()[:8])
+def test_stream_email_matches_generate_email(chunk_size):
+    generator = EmailGenerator(use_cache=False, llm=FakeStreamingLLM(COMPLETION, chunk_size))
+
+    expected = generator.generate_email(JOB, make_profile(), 'professional')
+    streamed = ''.join(generator.stream_email(JOB, make_profile(), 'professional'))
+
+    assert streamed == expected
+    assert 'Sincerely' not in streamed
+    assert '[Your Name]' not in streamed
+    assert 'jane@example.com' in streamed
+    assert streamed.startswith('Subject: Application for Backend Engineer')
+
+
+def test_stream_email_uses_injected_llm_for_the_same_prompt():
+    llm = FakeStreamingLLM(COMPLETION, 7)
+    generator = EmailGenerator(use_cache=False, llm=llm)
+
+    generator.generate_email(JOB, make_profile(), 'confident')
+    list(generator.stream_email(JOB, make_profile(), 'confident'))
+
+    assert len(llm.prompts) == 2
+    assert llm.prompts[0] == llm.prompts[1]
+
+
+def test_generate_emails_returns_prompt_metrics_per_result():
+    generator = EmailGenerator(use_cache=False, llm=FakeStreamingLLM(COMPLETION, 5))
+    jobs = [dict(JOB, title=f'Backend Engineer {i}', primary_skills=['Python'] * (i + 1)) for i in range(3)]
+
+    results = list(generator.generate_emails(jobs, make_profile(), 'professional'))
+
+    assert [result['error'] for result in results] == [None, None, None]
+    for result in results:
+        assert result['prompt_metrics']['prompt_tokens'] > 0
+        assert result['email'] == generator.generate_email(result['job'], make_profile(), 'professional')
+    assert not hasattr(generator, 'last_prompt_metrics')
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+class FlakyLLM(FakeStreamingLLM):
+    """Answers the first request with a 429, like a provider over its quota"""
+
+    def __init__(self, text, chunk_size):
+        super().__init__(text, chunk_size)
+        self.calls = 0
+
+    def _check_quota(self):
+        self.calls += 1
+        if self.calls == 1:
+            raise RateLimited("Rate limit reached")
+
+    def invoke(self, prompt):
+        self._check_quota()
+        return super().invoke(prompt)
+
+    def stream(self, prompt):
+        # Like a real client, the request is sent when the stream is first read
+        self._check_quota()
+        yield from super().stream(prompt)
+
+
+@pytest.mark.parametrize('method', ['generate_email', 'stream_email'])
+def test_single_email_paths_retry_rate_limits_through_the_limiter(method):
+    limiter = RateLimiter(requests_per_minute=10, tokens_per_minute=100000)
+    llm = FlakyLLM(COMPLETION, 6)
+    generator = EmailGenerator(use_cache=False, llm=llm, rate_limiter=limiter)
+
+    result = getattr(generator, method)(JOB, make_profile(), 'professional')
+    email = result if isinstance(result, str) else ''.join(result)
+
+    assert llm.calls == 2
+    assert email.startswith('Subject: Application for Backend Engineer')
+    # Both attempts were admitted by the shared limiter
+    assert len(limiter._window) == 2
+
+
+def test_sign_off_trimmer_keeps_text_without_sincerely():
+    trimmer = SignOffTrimmer()
+    text = "Dear team,\nThanks for reading.\nBest,\nJane  "
+    pieces = [trimmer.feed(text[i:i + 3]) for i in range(0, len(text), 3)]
+    assert ''.join(pieces) + trimmer.finish() == text
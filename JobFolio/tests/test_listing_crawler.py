@@ -0,0 +1,83 @@
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from listing_fixture_server import FixtureHandler
+from utils.http_cache import ResponseCache
+from utils.job_scraper import JobScraper
+from utils.listing_crawler import ListingCrawler, RobotsCache, get_shared_throttle
+from utils.strategy_store import DomainStrategyStore
+
+
+class QuickFixtureHandler(FixtureHandler):
+    # 6 pages of 5 postings, page 4 disallowed by robots.txt, plus a load-more fragment
+    crawl_delay = 0
+
+    def log_message(self, format, *args):
+        pass
+
+
+class NoNetwork:
+    def get(self, url, **kwargs):
+        raise AssertionError(f"unexpected request to {url}")
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), QuickFixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    return JobScraper(cache_dir=str(tmp_path / 'http'), strategy_store=DomainStrategyStore(str(tmp_path / 's.json')))
+
+
+def job_numbers(job_links):
+    return sorted(int(link.url.rsplit('/', 1)[1]) for link in job_links)
+
+
+def test_crawl_follows_pagination_and_load_more_but_skips_disallowed_page(site, scraper):
+    crawler = ListingCrawler(scraper, per_host_delay=0)
+
+    job_links = crawler.crawl(f"{site}/careers?page=1")
+
+    # Page 4 holds postings 15-19; the load-more fragment after page 6 holds 30-34
+    assert job_numbers(job_links) == [n for n in range(35) if not 15 <= n < 20]
+    assert all(link.text == f"Software Engineer {link.url.rsplit('/', 1)[1]}" for link in job_links)
+
+
+def test_crawl_stops_at_max_pages(site, scraper):
+    crawler = ListingCrawler(scraper, max_pages=2, per_host_delay=0)
+
+    assert job_numbers(crawler.crawl(f"{site}/careers?page=1")) == list(range(10))
+
+
+def test_crawl_stops_at_max_postings(site, scraper):
+    crawler = ListingCrawler(scraper, max_postings=7, per_host_delay=0)
+
+    assert len(crawler.crawl(f"{site}/careers?page=1")) == 7
+
+
+def test_crawlers_share_one_host_throttle(scraper):
+    assert ListingCrawler(scraper).throttle is ListingCrawler(scraper).throttle is get_shared_throttle()
+
+
+def test_offline_robots_uses_cached_copy_without_requests(site, scraper, tmp_path):
+    RobotsCache(scraper.session, cache=scraper.cache).allowed(f"{site}/careers?page=1")
+
+    offline = RobotsCache(NoNetwork(), cache=scraper.cache, offline=True)
+    assert offline.allowed(f"{site}/careers?page=1")
+    assert not offline.allowed(f"{site}/careers?page=4")
+
+    # A site that was never cached is not restricted and is not fetched
+    empty = RobotsCache(NoNetwork(), cache=ResponseCache(str(tmp_path / 'empty')), offline=True)
+    assert empty.allowed("http://uncached.example/careers")
@@ -0,0 +1,107 @@
+import sys
+import types
+
+import pytest
+
+from utils import pipeline
+
+
+@pytest.fixture
+def fake_db_manager(monkeypatch):
+    """utils.db_manager without chromadb: DBManager is a plain object"""
+    module = types.ModuleType('utils.db_manager')
+    module.DBManager = type('DBManager', (), {})
+    monkeypatch.setitem(sys.modules, 'utils.db_manager', module)
+    return module
+
+
+def test_worker_components_use_the_app_generator_config(monkeypatch, fake_db_manager, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("JOBFOLIO_SEMANTIC_CACHE", "1")
+    monkeypatch.setenv("JOBFOLIO_SEMANTIC_THRESHOLD", "0.8")
+    monkeypatch.setattr(pipeline, '_components', None)
+
+    app_generator = pipeline.build_email_generator()
+    worker_generator = pipeline.default_components().email_generator
+
+    for generator in (app_generator, worker_generator):
+        assert generator.semantic_cache is not None
+        assert generator.semantic_cache.threshold == 0.8
+        assert isinstance(generator.semantic_cache.db_manager, fake_db_manager.DBManager)
+
+
+def test_resume_text_is_written_to_disk_only_when_enabled(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("JOBFOLIO_RESUME_DISK_CACHE", raising=False)
+    assert pipeline.build_resume_ingestor().disk is None
+
+    monkeypatch.setenv("JOBFOLIO_RESUME_DISK_CACHE", "1")
+    assert pipeline.build_resume_ingestor().disk.ttl == 24 * 3600
+
+
+class Context:
+    def __init__(self):
+        self.reports = []
+
+    def progress(self, **info):
+        self.reports.append(info)
+
+
+class FakeScraper:
+    def __init__(self, jobs):
+        self.jobs = jobs
+
+    def extract_job_link_records(self, listing_url):
+        return [job['url'] for job in self.jobs]
+
+    def iter_matching_jobs(self, job_links, resume, top_k):
+        yield {'ranking': self.jobs[:top_k], 'fetched': len(self.jobs), 'total': len(self.jobs), 'done': True}
+
+
+class FakeIngestor:
+    def extract_text(self, pdf_bytes):
+        return pdf_bytes.decode('utf-8')
+
+
+class FakeGenerator:
+    metrics = {'prompt_tokens': 120, 'tokens_saved': 30}
+
+    def build_resume_profile(self, text):
+        return text
+
+    def generate_emails(self, jobs, resume, tone, regenerate=False):
+        # The lowest-ranked job finishes first
+        for job in reversed(jobs):
+            yield {'job': job, 'email': f"Email for {job['title']}", 'error': None, 'prompt_metrics': self.metrics}
+
+    def stream_email(self, job, resume, tone, regenerate=False, on_metrics=None):
+        on_metrics(self.metrics)
+        yield "Dear team, "
+        yield "hello."
+
+
+def make_jobs(count):
+    return [{'title': f"Job {i}", 'company': 'Acme', 'url': f"https://example.com/job/{i}", 'score': 1.0 - i / 10}
+            for i in range(count)]
+
+
+def run(jobs, email_count):
+    components = pipeline.Components(FakeScraper(jobs), FakeGenerator(), FakeIngestor(), None)
+    return pipeline.run_email_pipeline(Context(), 'https://example.com/careers', b'Jane Doe resume', 'professional',
+                                       email_count=email_count, components=components)
+
+
+def test_batch_emails_are_returned_in_rank_order():
+    result = run(make_jobs(5), email_count=3)
+
+    assert [email['rank'] for email in result['emails']] == [0, 1, 2]
+    assert [email['job']['title'] for email in result['emails']] == ['Job 0', 'Job 1', 'Job 2']
+
+
+def test_streamed_email_carries_its_prompt_metrics():
+    result = run(make_jobs(2), email_count=1)
+
+    [email] = result['emails']
+    assert email['email'] == "Dear team, hello."
+    assert email['rank'] == 0
+    assert email['prompt_metrics'] == FakeGenerator.metrics
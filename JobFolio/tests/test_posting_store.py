@@ -0,0 +1,17 @@
+from utils import posting_store
+from utils.posting_store import PostingStore
+
+
+def test_sync_listing_handles_more_urls_than_sqlite_parameters(tmp_path, monkeypatch):
+    store = PostingStore(str(tmp_path / 'postings.sqlite3'))
+    links = [(f"https://example.com/job/{i}", f"Engineer {i}") for i in range(2500)]
+
+    assert store.sync_listing('https://example.com/careers', links) == {'new': 2500, 'changed': 0, 'stale': 0}
+
+    # Small chunks must still find every known posting
+    monkeypatch.setattr(posting_store, 'QUERY_CHUNK_SIZE', 7)
+    renamed = [(url, f"Senior {text}") if i % 100 == 0 else (url, text) for i, (url, text) in enumerate(links)]
+    counts = store.sync_listing('https://example.com/careers', renamed[:2000])
+
+    assert counts == {'new': 0, 'changed': 20, 'stale': 500}
+    store.close()
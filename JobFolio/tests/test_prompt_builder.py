@@ -0,0 +1,10 @@
+from utils.prompt_builder import PromptBuilder
+
+
+def test_compact_skills_truncates_long_requirements_instead_of_dropping_them():
+    builder = PromptBuilder(max_skill_words=5, token_counter=lambda text: len(text.split()))
+    requirement = "Experience designing and operating distributed systems on AWS with Terraform"
+
+    skills = builder.compact_skills(['Python', requirement, 'python', 'Home', '2+'])
+
+    assert skills == ['Python', 'Experience designing and operating distributed']
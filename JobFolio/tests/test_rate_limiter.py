@@ -0,0 +1,138 @@
+import asyncio
+import itertools
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import pytest
+import requests
+
+from benchmarks.stub_llm_server import EMAIL, StubHandler
+from utils.rate_limiter import (RateLimiter, backoff_delay, call_with_backoff, call_with_backoff_blocking,
+                                is_rate_limit_error, retry_after)
+
+
+def start_stub(rate_limit_every=0, retry_after_seconds=1):
+    handler = type('TestStubHandler', (StubHandler,), {
+        'counter': itertools.count(1),
+        'lock': threading.Lock(),
+        'latency': 0.0,
+        'rate_limit_every': rate_limit_every,
+        'retry_after': retry_after_seconds,
+        'log_message': lambda self, format, *args: None,
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/openai/v1/chat/completions"
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(**options):
+        server, url = start_stub(**options)
+        servers.append(server)
+        return url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class Client:
+    """Minimal chat-completions client that raises requests' HTTPError (with .response) on 429"""
+
+    def __init__(self, url):
+        self.url = url
+        self.requests = 0
+
+    def complete(self, title='Backend Engineer', stream=False):
+        self.requests += 1
+        payload = {'model': 'stub', 'stream': stream,
+                   'messages': [{'role': 'user', 'content': f"Job Title: {title}"}]}
+        response = requests.post(self.url, json=payload, stream=stream, timeout=10)
+        response.raise_for_status()
+        if not stream:
+            return response.json()['choices'][0]['message']['content']
+        content = []
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith('data: ') or line == 'data: [DONE]':
+                continue
+            content.append(json.loads(line[len('data: '):])['choices'][0]['delta'].get('content') or '')
+        return ''.join(content)
+
+
+def test_request_window_blocks_until_the_oldest_request_expires():
+    limiter = RateLimiter(requests_per_minute=2, tokens_per_minute=10000, period=0.5)
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.acquire_blocking(10)
+    assert time.monotonic() - started >= 0.45
+
+
+def test_token_window_blocks_when_the_budget_is_spent():
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=100, period=0.5)
+    started = time.monotonic()
+    limiter.acquire_blocking(60)
+    limiter.acquire_blocking(60)
+    assert time.monotonic() - started >= 0.45
+
+
+def test_retry_after_is_a_floor_for_the_backoff():
+    class Limited(Exception):
+        status_code = 429
+
+        class response:
+            headers = {'Retry-After': '2'}
+
+    for attempt in range(3):
+        assert backoff_delay(Limited(), attempt, base_delay=0.1) >= 2
+
+
+def test_blocking_call_retries_a_429_after_retry_after(stub):
+    client = Client(stub(rate_limit_every=2, retry_after_seconds=0.4))
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=100000)
+
+    assert 'Backend Engineer' in call_with_backoff_blocking(limiter, client.complete, 10, base_delay=0.01)
+    started = time.monotonic()
+    email = call_with_backoff_blocking(limiter, client.complete, 10, base_delay=0.01)
+
+    assert email == EMAIL.format(title='Backend Engineer')
+    assert client.requests == 3
+    assert time.monotonic() - started >= 0.4
+
+
+def test_gives_up_after_max_retries(stub):
+    client = Client(stub(rate_limit_every=1, retry_after_seconds=0.1))
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=100000)
+
+    with pytest.raises(requests.HTTPError) as raised:
+        call_with_backoff_blocking(limiter, client.complete, 10, max_retries=2, base_delay=0.01)
+
+    assert is_rate_limit_error(raised.value)
+    assert retry_after(raised.value) == 0.1
+    assert client.requests == 3
+
+
+def test_async_call_retries_against_the_stub(stub):
+    client = Client(stub(rate_limit_every=2, retry_after_seconds=0.2))
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=100000)
+
+    async def generate(count):
+        calls = [call_with_backoff(limiter, lambda title=f"Role {i}": asyncio.to_thread(client.complete, title), 10,
+                                   base_delay=0.01) for i in range(count)]
+        return await asyncio.gather(*calls)
+
+    emails = asyncio.run(generate(3))
+
+    assert sorted(emails) == sorted(EMAIL.format(title=f"Role {i}") for i in range(3))
+    # Every second request was rate limited and retried
+    assert client.requests > 3
+
+
+def test_stub_streams_server_sent_events(stub):
+    client = Client(stub())
+    assert client.complete(title='Data Engineer', stream=True) == EMAIL.format(title='Data Engineer')
@@ -0,0 +1,62 @@
+from utils.email_generator import EmailGenerator
+from utils.resume_profile import ResumeProfile, resume_fingerprint
+from utils.semantic_cache import SemanticEmailCache
+
+RESUME = "Jane Doe\njane@example.com\n\nSkills\nPython,   AWS\n"
+
+
+class FakeDBManager:
+    """Stores generations in a list and returns the first one whose metadata matches the filter"""
+
+    def __init__(self):
+        self.generations = []
+
+    def store_generation(self, generation_id, signature, email, metadata):
+        self.generations.append({'id': generation_id, 'email': email, 'metadata': metadata})
+
+    def find_similar_generation(self, signature, where, min_similarity):
+        wanted = {key: value for condition in where['$and'] for key, value in condition.items()}
+        for generation in self.generations:
+            if all(generation['metadata'].get(key) == value for key, value in wanted.items()):
+                return generation
+        return None
+
+
+class RecordingCache(SemanticEmailCache):
+    def __init__(self, db_manager):
+        super().__init__(db_manager)
+        self.resumes = []
+
+    def lookup(self, job_details, resume, tone):
+        self.resumes.append(resume)
+        return super().lookup(job_details, resume, tone)
+
+
+class FakeLLM:
+    def invoke(self, prompt):
+        return "Dear team,\nI would love to join.\nSincerely,\nJane"
+
+
+JOB = {'title': 'Data Engineer', 'company': 'Acme', 'location': 'Berlin',
+       'primary_skills': ['Python'], 'experience': '2 years'}
+
+
+def test_profile_fingerprint_matches_text_fingerprint():
+    profile = ResumeProfile(RESUME)
+    assert resume_fingerprint(profile) == profile.fingerprint == resume_fingerprint("Jane Doe jane@example.com "
+                                                                                    "Skills Python, AWS")
+
+
+def test_generator_passes_the_profile_to_the_semantic_cache():
+    cache = RecordingCache(FakeDBManager())
+    generator = EmailGenerator(use_cache=False, semantic_cache=cache, llm=FakeLLM())
+    profile = ResumeProfile(RESUME, contact_details={'name': 'Jane Doe', 'phone': None, 'email': 'jane@example.com',
+                                                     'linkedin': None, 'location': None, 'portfolio': None})
+
+    first = generator.generate_email(JOB, profile, 'professional')
+    second = generator.generate_email(dict(JOB, location='Munich'), profile, 'professional')
+
+    assert cache.resumes == [profile, profile]
+    assert cache.db_manager.generations[0]['metadata']['resume'] == profile.fingerprint
+    assert cache.stats() == {'hits': 1, 'misses': 1}
+    assert first == second
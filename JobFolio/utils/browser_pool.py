@@ -0,0 +1,194 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+# Bağlantı listesini etkilemeyen ağır kaynaklar yüklenmez
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.mp3', '*.wav', '*.ogg', '*.m4a'
+]
+
+# Tek bir execute_script çağrısıyla sayfanın durumu okunur
+PAGE_STATE_SCRIPT = """
+return [
+    document.readyState,
+    document.querySelectorAll('a[href]').length,
+    performance.getEntriesByType('resource').length,
+    document.body ? document.body.scrollHeight : 0
+];
+"""
+
+COLLECT_LINKS_SCRIPT = """
+return Array.from(document.querySelectorAll('a[href]'), a => [a.href, (a.innerText || '').trim().slice(0, 200)]);
+"""
+
+
+def build_chrome_driver(chromedriver_path: Optional[str] = None, block_resources: bool = True):
+    """Start a headless Chrome that skips images, fonts and media"""
+    options = Options()
+    options.add_argument('--headless=new')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    if block_resources:
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+
+    # Proje dizininde chromedriver.exe varsa o kullanılır, yoksa Selenium Manager sürücüyü bulur
+    chromedriver_path = chromedriver_path or os.path.join(os.getcwd(), "chromedriver.exe")
+    service = Service(executable_path=chromedriver_path) if os.path.exists(chromedriver_path) else Service()
+    driver = webdriver.Chrome(service=service, options=options)
+
+    if block_resources:
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            print(f"Could not enable resource blocking: {e}")
+    return driver
+
+
+def wait_for_page_settled(driver, timeout: float = 10, settle: float = 0.75, poll: float = 0.2) -> Tuple:
+    """
+    Wait until the document is loaded and both the anchor count and the number of
+    network requests have stopped changing for `settle` seconds (or `timeout` passes).
+    Returns the last observed page state.
+    """
+    deadline = time.monotonic() + timeout
+    last_state = None
+    stable_since = None
+    while True:
+        ready_state, anchors, resources, height = driver.execute_script(PAGE_STATE_SCRIPT)
+        state = (anchors, resources, height)
+        now = time.monotonic()
+        if ready_state == 'complete' and state == last_state:
+            if stable_since is None:
+                stable_since = now
+            elif now - stable_since >= settle:
+                break
+        else:
+            stable_since = None
+        last_state = state
+        if now >= deadline:
+            break
+        time.sleep(poll)
+    return last_state
+
+
+def collect_rendered_links(driver, url: str, max_scrolls: int = 3, timeout: float = 10) -> List[Tuple[str, str]]:
+    """Load a listing page, scroll until no new content appears and return every (href, text) anchor"""
+    driver.get(url)
+    state = wait_for_page_settled(driver, timeout=timeout)
+
+    # Sayfayı aşağı kaydır (Baykar gibi dinamik yüklenen siteler için)
+    for _ in range(max_scrolls):
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        new_state = wait_for_page_settled(driver, timeout=timeout)
+        if new_state == state:
+            break
+        state = new_state
+
+    return driver.execute_script(COLLECT_LINKS_SCRIPT) or []
+
+
+class BrowserPool:
+    """
+    A pool of warm headless Chrome drivers leased one request at a time.
+    Drivers are recycled after `max_uses` leases and discarded after an error.
+    """
+
+    def __init__(self, size: int = 2, max_uses: int = 20, chromedriver_path: Optional[str] = None,
+                 driver_factory: Optional[Callable] = None):
+        self.size = size
+        self.max_uses = max_uses
+        self.driver_factory = driver_factory or (lambda: build_chrome_driver(chromedriver_path))
+        self._idle = queue.LifoQueue()
+        self._uses: Dict[int, int] = {}
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def lease(self):
+        self._slots.acquire()
+        driver = None
+        try:
+            driver = self._acquire_driver()
+            yield driver
+        except Exception:
+            if driver is not None:
+                self._discard(driver)
+                driver = None
+            raise
+        finally:
+            if driver is not None:
+                self._release_driver(driver)
+            self._slots.release()
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+    def _acquire_driver(self):
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            driver = self.driver_factory()
+            with self._lock:
+                self._uses[id(driver)] = 0
+            return driver
+
+    def _release_driver(self, driver) -> None:
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+        if self._closed or uses >= self.max_uses:
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    def _discard(self, driver) -> None:
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+
+
+# Streamlit yeniden çalıştırmalarında da aynı sıcak tarayıcılar kullanılır
+_shared_pools: Dict[Tuple, BrowserPool] = {}
+_shared_pools_lock = threading.Lock()
+
+
+def get_shared_browser_pool(chromedriver_path: Optional[str] = None, size: int = 2, max_uses: int = 20) -> BrowserPool:
+    key = (chromedriver_path, size, max_uses)
+    with _shared_pools_lock:
+        pool = _shared_pools.get(key)
+        if pool is None:
+            pool = BrowserPool(size=size, max_uses=max_uses, chromedriver_path=chromedriver_path)
+            _shared_pools[key] = pool
+        return pool
+
+
+@atexit.register
+def _close_shared_pools() -> None:
+    with _shared_pools_lock:
+        for pool in _shared_pools.values():
+            pool.close()
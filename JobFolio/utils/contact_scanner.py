@@ -0,0 +1,85 @@
+import re
+from typing import Dict, Optional
+
+# Patterns for contact information, in priority order per field.
+# Each pattern carries the lowercase literals one of which must occur for it to
+# match at all; a pattern is only run when the text contains such a literal.
+CONTACT_PATTERNS = {
+    'phone': [
+        (r'(?:Phone|Tel|Mobile|Cell):?\s*(\+?\d[\d\s.-]{8,})', ('phone', 'tel', 'mobile', 'cell')),
+        (r'\b(?:\+\d{1,2}\s?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b', ()),
+        (r'\b\d{10}\b', ()),
+        (r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', ())
+    ],
+    'email': [
+        (r'(?:Email|E-mail):?\s*([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})', ('email', 'e-mail')),
+        (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', ('@',))
+    ],
+    'linkedin': [
+        (r'(?:LinkedIn|Profile):?\s*((?:https?:\/\/)?(?:www\.)?linkedin\.com\/(?:in|profile)\/[\w-]+)',
+         ('linkedin.com',)),
+        (r'\blinkedin\.com\/(?:in|profile)\/[\w-]+\b', ('linkedin.com',))
+    ],
+    'location': [
+        (r'(?:Location|Address):?\s*([\w\s,.-]+(?:\d{5})?)', ('location', 'address')),
+        (r'\b[A-Z][a-zA-Z\s]+,\s*[A-Z]{2}\s*\d{5}\b', (',',))
+    ],
+    'portfolio': [
+        (r'(?:Portfolio|Website|Blog):?\s*((?:https?:\/\/)?(?:www\.)?[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})',
+         ('portfolio', 'website', 'blog')),
+        (r'\b(?:https?:\/\/)?(?:www\.)?[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', ('.',))
+    ]
+}
+
+HEADER_LINES = 10
+
+
+class ContactScanner:
+    """
+    Finds phone, e-mail, LinkedIn, location and portfolio in a resume.
+    Patterns are compiled once. The text is joined and lowercased once. The
+    header (the first 10 lines) is searched in place with endpos instead of as a
+    copy, and a pattern is skipped when none of its required literals occur.
+    The results are the same as the previous per-call re.search loop.
+    """
+
+    def __init__(self, patterns=CONTACT_PATTERNS, header_lines: int = HEADER_LINES):
+        self.header_lines = header_lines
+        self.patterns = {
+            field: [(re.compile(pattern, re.IGNORECASE), literals) for pattern, literals in field_patterns]
+            for field, field_patterns in patterns.items()
+        }
+
+    def scan(self, resume_text: str) -> Dict[str, Optional[str]]:
+        lines = resume_text.strip().split('\n')
+        clean_text = ' '.join(lines)
+        # The header is a prefix of the joined text
+        header_end = len(' '.join(lines[:self.header_lines]))
+        # Lowercased separately: lower() may change the length of some characters (e.g. 'İ')
+        header_lowered = clean_text[:header_end].lower()
+        lowered = None
+
+        contact_details = {}
+        for field, field_patterns in self.patterns.items():
+            # Try header section first, then the full text
+            value = self._search(field_patterns, clean_text, header_lowered, header_end)
+            if not value:
+                if lowered is None:
+                    lowered = clean_text.lower()
+                value = self._search(field_patterns, clean_text, lowered, len(clean_text))
+            contact_details[field] = value or None
+        return contact_details
+
+    @staticmethod
+    def _search(field_patterns, text: str, lowered: str, end: int) -> Optional[str]:
+        for pattern, literals in field_patterns:
+            if literals and not any(literal in lowered for literal in literals):
+                continue
+            match = pattern.search(text, 0, end)
+            if match:
+                value = match.group(1) if pattern.groups > 0 else match.group(0)
+                return value.strip()
+        return None
+
+
+CONTACT_SCANNER = ContactScanner()
@@ -1,29 +1,154 @@
 import chromadb
-from chromadb.config import Settings
+import hashlib
+import json
 import os
+import threading
+
+DEFAULT_PERSIST_DIRECTORY = "data/chroma_db"
+# Records per upsert/query request; each request embeds its documents in one batch
+DEFAULT_BATCH_SIZE = 256
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_persistent_client(persist_directory=DEFAULT_PERSIST_DIRECTORY):
+    """One PersistentClient per directory and process, shared by every Streamlit session"""
+    path = os.path.abspath(persist_directory)
+    with _clients_lock:
+        client = _clients.get(path)
+        if client is None:
+            client = chromadb.PersistentClient(path=path)
+            _clients[path] = client
+        return client
+
+
+def content_id(document, metadata=None):
+    """Id derived from the content, so the same record always maps to the same row"""
+    payload = json.dumps([document, metadata or {}], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _clean_metadata(metadata):
+    # Chroma only accepts str, int, float and bool metadata values
+    return {key: ('' if value is None else value) for key, value in (metadata or {}).items()}
+
 
 class DBManager:
-    def __init__(self):
-        self.client = chromadb.Client(Settings(
-            chroma_db_impl="duckdb+parquet",
-            persist_directory="data/chroma_db"
-        ))
+    def __init__(self, persist_directory=DEFAULT_PERSIST_DIRECTORY, client=None, batch_size=DEFAULT_BATCH_SIZE):
+        self.client = client or get_persistent_client(persist_directory)
+        self.batch_size = batch_size
         self.collection = self.client.get_or_create_collection("job_applications")
+        # Job + resume signatures of past generations, compared by cosine similarity
+        self.generations = self.client.get_or_create_collection(
+            "email_generations", metadata={"hnsw:space": "cosine"}
+        )
+
+    def store_many(self, records, collection=None):
+        """
+        Upsert many records in batches. Each record is a dict with 'document',
+        optional 'metadata' and optional 'id' (a content hash by default).
+        Returns the ids in input order.
+        """
+        collection = collection or self.collection
+        all_ids = []
+        batch = []
+        for record in records:
+            metadata = _clean_metadata(record.get('metadata'))
+            record_id = record.get('id') or content_id(record['document'], metadata)
+            batch.append((record_id, record['document'], metadata))
+            if len(batch) >= self.batch_size:
+                all_ids.extend(self._upsert(collection, batch))
+                batch = []
+        if batch:
+            all_ids.extend(self._upsert(collection, batch))
+        return all_ids
+
+    @staticmethod
+    def _upsert(collection, batch):
+        # The same id twice in one request is rejected; the last occurrence wins
+        unique = {record_id: (document, metadata) for record_id, document, metadata in batch}
+        with_metadata = [record_id for record_id, (_, metadata) in unique.items() if metadata]
+        without_metadata = [record_id for record_id, (_, metadata) in unique.items() if not metadata]
+        # Chroma rejects empty metadata dicts, so records without metadata go in their own request
+        if with_metadata:
+            collection.upsert(
+                ids=with_metadata,
+                documents=[unique[record_id][0] for record_id in with_metadata],
+                metadatas=[unique[record_id][1] for record_id in with_metadata]
+            )
+        if without_metadata:
+            collection.upsert(
+                ids=without_metadata,
+                documents=[unique[record_id][0] for record_id in without_metadata]
+            )
+        return [record_id for record_id, _, _ in batch]
+
+    def query_many(self, queries, n_results=3, where=None, collection=None):
+        """
+        Run many similarity queries in batched requests. Returns one list of matches
+        ({'id', 'document', 'metadata', 'distance'}) per query, nearest first.
+        """
+        collection = collection or self.collection
+        queries = list(queries)
+        matches = []
+        for start in range(0, len(queries), self.batch_size):
+            results = collection.query(
+                query_texts=queries[start:start + self.batch_size],
+                n_results=n_results,
+                where=where
+            )
+            for i, ids in enumerate(results['ids']):
+                matches.append([
+                    {
+                        'id': record_id,
+                        'document': results['documents'][i][j] if results.get('documents') else None,
+                        'metadata': results['metadatas'][i][j] if results.get('metadatas') else None,
+                        'distance': results['distances'][i][j] if results.get('distances') else None
+                    }
+                    for j, record_id in enumerate(ids)
+                ])
+        return matches
 
     def store_job_details(self, job_details, email_content):
-        self.collection.add(
-            documents=[email_content],
-            metadatas=[{
+        return self.store_many([{
+            'document': email_content,
+            'metadata': {
                 "job_title": job_details['title'],
                 "company": job_details['company'],
                 "location": job_details['location']
-            }],
-            ids=[f"{job_details['company']}_{job_details['title']}".replace(" ", "_")]
-        )
+            }
+        }])[0]
 
     def get_similar_emails(self, query, n_results=3):
         results = self.collection.query(
             query_texts=[query],
             n_results=n_results
         )
-        return results 
+        return results
+
+    def find_similar_emails(self, query, n_results=3):
+        """Matches for one query as a list ({'id', 'document', 'metadata', 'distance'}), nearest first"""
+        return self.query_many([query], n_results=n_results)[0]
+
+    def store_generation(self, generation_id, signature, email_content, metadata):
+        self.store_many([{
+            'id': generation_id,
+            'document': signature,
+            'metadata': dict(metadata, email=email_content)
+        }], collection=self.generations)
+
+    def find_similar_generation(self, signature, where=None, min_similarity=0.92):
+        """Return the closest past generation ({'email', 'metadata', 'similarity'}) above min_similarity"""
+        matches = self.query_many([signature], n_results=1, where=where, collection=self.generations)[0]
+        if not matches:
+            return None
+        similarity = 1 - matches[0]['distance']
+        if similarity < min_similarity:
+            return None
+        metadata = dict(matches[0]['metadata'])
+        return {
+            'email': metadata.pop('email'),
+            'metadata': metadata,
+            'similarity': similarity
+        }
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Tüm disk önbellekleri (HTTP yanıtları vb.) proje dizinindeki bu klasörün altında tutulur
+CACHE_ROOT = os.path.join(os.getcwd(), ".jobfolio_cache")
+
+
+class DiskCache:
+    """
+    A small JSON-file cache with TTL expiry and size-based eviction.
+    Every key is stored in its own file; the least recently used files are
+    removed first once the directory grows beyond max_bytes.
+    """
+
+    def __init__(self, directory: str, ttl: Optional[float] = None, max_bytes: int = 100 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._size = self._scan_size()
+
+    def get(self, key: str, allow_expired: bool = False) -> Optional[Dict[str, Any]]:
+        """Return the stored entry ({'stored_at': ..., 'value': ...}) or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not allow_expired and not self.is_fresh(entry):
+            self.delete(key)
+            return None
+
+        # mtime son erişim zamanı olarak kullanılır (LRU tahliyesi için)
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None) -> None:
+        entry = {'key': key, 'stored_at': stored_at or time.time(), 'value': value}
+        data = json.dumps(entry, ensure_ascii=False).encode('utf-8')
+        path = self._path(key)
+
+        with self._lock:
+            old_size = self._file_size(path)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self._size += len(data) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def delete(self, key: str) -> None:
+        path = self._path(key)
+        with self._lock:
+            size = self._file_size(path)
+            try:
+                os.remove(path)
+                self._size -= size
+            except OSError:
+                pass
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        if self.ttl is None:
+            return True
+        return time.time() - entry.get('stored_at', 0) < self.ttl
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _scan_size(self) -> int:
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith('.json'):
+                total += entry.stat().st_size
+        return total
+
+    def _evict(self) -> None:
+        """Drop least recently used files until the cache is back under 90% of max_bytes"""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith('.json'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort()
+
+        total = sum(size for _, size, _ in files)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._size = total
+
+    @staticmethod
+    def _file_size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
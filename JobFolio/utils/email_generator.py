@@ -1,46 +1,22 @@
-from langchain_groq import ChatGroq
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
+import asyncio
+import itertools
 import os
+import queue
 import re
-import spacy
 import subprocess
+import threading
+from functools import lru_cache
 
-class EmailGenerator:
-    """
-    A class to generate personalized cold emails for job applications.
-    Uses the Groq LLM to create human-like, contextually relevant emails
-    based on job details and resume content.
-    """
-    
-    def __init__(self):
-        self.llm = ChatGroq(
-            api_key=os.getenv("GROQ_API_KEY"),
-            model_name="llama3-70b-8192"
-        )
-        
-        # Load spaCy model with better error handling
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            print("Downloading spaCy English model...")
-            try:
-                # Try using pip to install the model
-                subprocess.run(["pip", "install", "en-core-web-sm"], check=True)
-                self.nlp = spacy.load("en_core_web_sm")
-            except:
-                try:
-                    # If pip install fails, try using spacy download command
-                    subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"], check=True)
-                    self.nlp = spacy.load("en_core_web_sm")
-                except:
-                    print("Warning: Could not load spaCy model. Name extraction will use fallback methods.")
-                    self.nlp = None
-        
-        # Updated template to use resume content and tone
-        self.email_template = PromptTemplate(
-            input_variables=["job_title", "company", "skills", "experience", "resume", "tone"],
-            template="""
+from utils.contact_scanner import CONTACT_SCANNER
+from utils.llm_cache import LLMResponseCache
+from utils.prompt_builder import PromptBuilder
+from utils.rate_limiter import RateLimiter, call_with_backoff, call_with_backoff_blocking
+from utils.resume_profile import ResumeProfile
+from utils.tracing import current_span, span, use_span
+
+# spaCy ve langchain içe aktarımı yavaştır; ilk gerçek kullanımda yüklenirler
+
+EMAIL_TEMPLATE = """
             Write a personalized cold email for a job application with the following details:
             Job Title: {job_title}
             Company: {company}
@@ -73,14 +49,217 @@ class EmailGenerator:
 
             Write the complete email now, including the subject line:
             """
+
+
+# Components that PERSON detection does not need
+NON_NER_COMPONENTS = ("tagger", "parser", "senter", "attribute_ruler", "lemmatizer")
+
+# Method 2: Common resume header patterns
+NAME_PATTERNS = [
+    re.compile(r"^([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,2})"),  # Standard name format
+    re.compile(r"Name:?\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,2})"),  # "Name: John Doe"
+    re.compile(r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,2})\s*(?:Resume|CV)"),  # "John Doe Resume"
+]
+
+NAME_LABEL_PATTERN = re.compile(r"^\s*(?:full\s+)?name\s*[:\-]\s*(.+)$", re.IGNORECASE)
+NAME_WORD_PATTERN = re.compile(r"^[A-Z][A-Za-z'\-]*\.?$")
+
+# A header line containing any of these is a title or heading, not a name
+NON_NAME_WORDS = frozenset([
+    'resume', 'cv', 'curriculum', 'vitae', 'profile', 'summary', 'contact', 'objective', 'experience',
+    'education', 'skills', 'engineer', 'developer', 'manager', 'designer', 'analyst', 'scientist',
+    'consultant', 'intern', 'student', 'senior', 'junior', 'lead', 'software', 'data', 'email', 'phone'
+])
+
+
+SIGN_OFF_PATTERN = re.compile("sincerely", re.IGNORECASE)
+
+
+class SignOffTrimmer:
+    """
+    Incremental version of cutting the email at its last "sincerely".
+    Text is released as soon as it is certain to survive the cut: everything
+    from the last "sincerely" seen so far, a possible partial match at the end
+    and trailing whitespace are held back until more text (or the end) arrives.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._started = False
+        self._cut = False
+
+    def feed(self, chunk):
+        self._buffer += chunk
+        if not self._started:
+            self._buffer = self._buffer.lstrip()
+            if not self._buffer:
+                return ""
+            self._started = True
+
+        last = None
+        for last in SIGN_OFF_PATTERN.finditer(self._buffer):
+            pass
+        if last is not None:
+            self._cut = True
+            safe_end = last.start()
+        else:
+            safe_end = max(0, len(self._buffer) - (len("sincerely") - 1))
+
+        ready = self._buffer[:safe_end].rstrip()
+        self._buffer = self._buffer[len(ready):]
+        return ready
+
+    def finish(self):
+        # Without a "sincerely" the held-back tail is kept as is
+        rest = "" if self._cut else self._buffer
+        self._buffer = ""
+        return rest
+
+
+# Room left for the completion when reserving tokens-per-minute capacity
+EXPECTED_COMPLETION_TOKENS = 500
+
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop():
+    """
+    One event loop per process, running in a daemon thread, for the blocking
+    wrappers. The async LLM client keeps connections bound to the loop that
+    opened them, so every batch runs on this same loop.
+    """
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            threading.Thread(target=_background_loop.run_forever, daemon=True).start()
+        return _background_loop
+
+
+def trim_sign_off(email):
+    """Find the position of "sincerely" and remove everything after it"""
+    trimmer = SignOffTrimmer()
+    return trimmer.feed(email) + trimmer.finish()
+
+
+@lru_cache(maxsize=None)
+def load_spacy_model(name="en_core_web_sm", exclude=()):
+    """
+    Load a spaCy pipeline once per process. A failed load is cached as well,
+    so the download fallback runs at most once.
+    """
+    import spacy
+
+    # Load spaCy model with better error handling
+    try:
+        return spacy.load(name, exclude=list(exclude))
+    except OSError:
+        print("Downloading spaCy English model...")
+        try:
+            # Try using pip to install the model
+            subprocess.run(["pip", "install", "en-core-web-sm"], check=True)
+            return spacy.load(name, exclude=list(exclude))
+        except:
+            try:
+                # If pip install fails, try using spacy download command
+                subprocess.run(["python", "-m", "spacy", "download", name], check=True)
+                return spacy.load(name, exclude=list(exclude))
+            except:
+                print("Warning: Could not load spaCy model. Name extraction will use fallback methods.")
+                return None
+
+
+@lru_cache(maxsize=None)
+def load_ner_pipeline(name="en_core_web_sm"):
+    """Load the model with only the components entity recognition depends on"""
+    nlp = load_spacy_model(name, exclude=NON_NER_COMPONENTS)
+    if nlp is not None and "tok2vec" in nlp.pipe_names:
+        # The small English models give NER its own embedding layer; the shared one is then unused
+        listeners = getattr(nlp.get_pipe("tok2vec"), "listening_components", [])
+        if "ner" not in listeners:
+            nlp.disable_pipe("tok2vec")
+    return nlp
+
+
+def name_from_header(resume_text):
+    """
+    Cheap header rules: a "Name: ..." label or a first line that consists of
+    2-4 capitalized words and is not a job title or section heading.
+    """
+    lines = [line.strip() for line in resume_text.strip().split('\n')[:5] if line.strip()]
+    for line in lines:
+        match = NAME_LABEL_PATTERN.match(line)
+        if match:
+            return re.split(r"\s*[|,;•·\t]\s*", match.group(1).strip())[0]
+
+    if not lines:
+        return None
+    words = lines[0].split()
+    if not 2 <= len(words) <= 4:
+        return None
+    if any(word.lower().strip('.') in NON_NAME_WORDS for word in words):
+        return None
+    if not all(NAME_WORD_PATTERN.match(word) for word in words):
+        return None
+    name = ' '.join(words)
+    return name.title() if name.isupper() else name
+
+
+class EmailGenerator:
+    """
+    A class to generate personalized cold emails for job applications.
+    Uses the Groq LLM to create human-like, contextually relevant emails
+    based on job details and resume content.
+    """
+    
+    def __init__(self, model_name="llama3-70b-8192", name_extraction="fast", use_cache=True, response_cache=None,
+                 semantic_cache=None, prompt_builder=None, rate_limiter=None, max_concurrency=4, llm=None):
+        # The LLM client and spaCy model are created on first use; pass llm to use another chat model (or a fake)
+        self.model_name = model_name
+        # "fast": header rules, then an NER-only pipeline; "full": the complete spaCy pipeline first
+        self.name_extraction = name_extraction
+        # Completions are cached by model + rendered prompt so retries skip the LLM call
+        self.response_cache = response_cache or (LLMResponseCache() if use_cache else None)
+        # Optional SemanticEmailCache: reuses emails written for near-identical postings
+        self.semantic_cache = semantic_cache
+        # Keeps the prompt within a token budget; per-request metrics go on the trace span
+        self.prompt_builder = prompt_builder or PromptBuilder()
+        # Requests/tokens per minute of the provider account, shared by concurrent generations
+        self.rate_limiter = rate_limiter or RateLimiter(
+            requests_per_minute=int(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30")),
+            tokens_per_minute=int(os.getenv("GROQ_TOKENS_PER_MINUTE", "6000"))
         )
-        
-        self.chain = LLMChain(llm=self.llm, prompt=self.email_template)
+        self.max_concurrency = max_concurrency
+        self._llm = llm
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            from langchain_groq import ChatGroq
+
+            # GROQ_BASE_URL points the client at another endpoint, e.g. a local stub server
+            options = {"base_url": os.getenv("GROQ_BASE_URL")} if os.getenv("GROQ_BASE_URL") else {}
+            # The SDK's own retries are off so that 429s reach call_with_backoff and the shared limiter
+            self._llm = ChatGroq(
+                api_key=os.getenv("GROQ_API_KEY"),
+                model_name=self.model_name,
+                max_retries=0,
+                **options
+            )
+        return self._llm
+
+    @property
+    def nlp(self):
+        return load_spacy_model()
 
     def extract_name_from_resume(self, resume_text):
         """
         Extract the candidate's name from resume text using multiple methods
         """
+        if self.name_extraction == "fast":
+            return self.extract_names([resume_text])[0]
+
         # Clean the text
         clean_text = resume_text.strip().replace('\n', ' ')
         first_line = clean_text.split('.')[0].strip()
@@ -88,22 +267,47 @@ class EmailGenerator:
         # Method 1: Using spaCy for Named Entity Recognition (if available)
         if self.nlp is not None:
             try:
-                doc = self.nlp(first_line)
+                with span('spacy_ner', texts=1):
+                    doc = self.nlp(first_line)
                 person_names = [ent.text for ent in doc.ents if ent.label_ == "PERSON"]
                 if person_names:
                     return person_names[0]
             except Exception as e:
                 print(f"spaCy name extraction failed: {e}")
-        
-        # Method 2: Common resume header patterns
-        name_patterns = [
-            r"^([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,2})",  # Standard name format
-            r"Name:?\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,2})",  # "Name: John Doe"
-            r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,2})\s*(?:Resume|CV)",  # "John Doe Resume"
+
+        return self._name_from_patterns(clean_text, first_line)
+
+    def extract_names(self, resume_texts, batch_size=64):
+        """
+        Fast name extraction for one or many resumes: header rules first, then a
+        batched NER-only spaCy pass for the resumes the rules could not resolve,
+        then the regex fallbacks.
+        """
+        names = [name_from_header(text) for text in resume_texts]
+        clean_texts = [text.strip().replace('\n', ' ') for text in resume_texts]
+        first_lines = [clean_text.split('.')[0].strip() for clean_text in clean_texts]
+
+        pending = [i for i, name in enumerate(names) if name is None]
+        nlp = load_ner_pipeline() if pending else None
+        if nlp is not None:
+            try:
+                with span('spacy_ner', texts=len(pending)):
+                    docs = nlp.pipe((first_lines[i] for i in pending), batch_size=batch_size)
+                    for i, doc in zip(pending, docs):
+                        person_names = [ent.text for ent in doc.ents if ent.label_ == "PERSON"]
+                        if person_names:
+                            names[i] = person_names[0]
+            except Exception as e:
+                print(f"spaCy name extraction failed: {e}")
+
+        return [
+            name if name is not None else self._name_from_patterns(clean_texts[i], first_lines[i])
+            for i, name in enumerate(names)
         ]
-        
-        for pattern in name_patterns:
-            match = re.search(pattern, clean_text)
+
+    def _name_from_patterns(self, clean_text, first_line):
+        for pattern in NAME_PATTERNS:
+            match = pattern.search(clean_text)
             if match:
                 return match.group(1)
         
@@ -115,14 +319,29 @@ class EmailGenerator:
         
         return "Job Applicant"  # Default fallback
 
+    def build_resume_profile(self, resume_text):
+        """
+        Parse a resume once (contact details, name, token index, sections) so that
+        matching and every later email generation can reuse the result
+        """
+        return ResumeProfile(resume_text, contact_details=self.extract_contact_details(resume_text))
+
+    def _profile(self, resume):
+        if not isinstance(resume, ResumeProfile):
+            return self.build_resume_profile(resume)
+        if resume.contact_details is None:
+            resume.contact_details = self.extract_contact_details(resume.text)
+        return resume
+
     def extract_contact_details(self, resume_text):
         """
         Extract contact details including name, phone, email, and LinkedIn from resume
         """
-        # Clean the text and split into lines for better processing
-        lines = resume_text.strip().split('\n')
-        clean_text = ' '.join(lines)  # Keep a full text version for backup search
-        
+        if isinstance(resume_text, ResumeProfile):
+            if resume_text.contact_details is not None:
+                return dict(resume_text.contact_details)
+            resume_text = resume_text.text
+
         # Initialize contact details dictionary
         contact_details = {
             'name': None,
@@ -133,56 +352,12 @@ class EmailGenerator:
             'portfolio': None
         }
         
-        # Patterns for contact information
-        patterns = {
-            'phone': [
-                r'(?:Phone|Tel|Mobile|Cell):?\s*(\+?\d[\d\s.-]{8,})',
-                r'\b(?:\+\d{1,2}\s?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b',
-                r'\b\d{10}\b',
-                r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'
-            ],
-            'email': [
-                r'(?:Email|E-mail):?\s*([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})',
-                r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            ],
-            'linkedin': [
-                r'(?:LinkedIn|Profile):?\s*((?:https?:\/\/)?(?:www\.)?linkedin\.com\/(?:in|profile)\/[\w-]+)',
-                r'\blinkedin\.com\/(?:in|profile)\/[\w-]+\b'
-            ],
-            'location': [
-                r'(?:Location|Address):?\s*([\w\s,.-]+(?:\d{5})?)',
-                r'\b[A-Z][a-zA-Z\s]+,\s*[A-Z]{2}\s*\d{5}\b'
-            ],
-            'portfolio': [
-                r'(?:Portfolio|Website|Blog):?\s*((?:https?:\/\/)?(?:www\.)?[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})',
-                r'\b(?:https?:\/\/)?(?:www\.)?[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            ]
-        }
-        
         # Extract name first (using existing method)
-        contact_details['name'] = self.extract_name_from_resume(clean_text)
+        contact_details['name'] = self.extract_name_from_resume(resume_text)
         
-        # Look for contact details in the first few lines (usually header section)
-        header_text = ' '.join(lines[:10])  # Check first 10 lines for header info
-        
-        # Extract each type of contact detail
-        for detail_type, detail_patterns in patterns.items():
-            # Try header section first
-            for pattern in detail_patterns:
-                match = re.search(pattern, header_text, re.IGNORECASE)
-                if match:
-                    value = match.group(1) if len(match.groups()) > 0 else match.group(0)
-                    contact_details[detail_type] = value.strip()
-                    break
-            
-            # If not found in header, try full text
-            if not contact_details[detail_type]:
-                for pattern in detail_patterns:
-                    match = re.search(pattern, clean_text, re.IGNORECASE)
-                    if match:
-                        value = match.group(1) if len(match.groups()) > 0 else match.group(0)
-                        contact_details[detail_type] = value.strip()
-                        break
+        # Phone, email, LinkedIn, location and portfolio in a single regex pass
+        with span('contact_regex', chars=len(resume_text)):
+            contact_details.update(CONTACT_SCANNER.scan(resume_text))
         
         # Clean up LinkedIn URL
         if contact_details['linkedin']:
@@ -191,29 +366,185 @@ class EmailGenerator:
         
         return contact_details
 
-    def generate_email(self, job_details, resume_text, tone):
+    def generate_email(self, job_details, resume_text, tone, regenerate=False):
         """
         Generates a personalized cold email based on the job details and resume.
+        resume_text may be a ResumeProfile, which skips re-parsing the resume.
+        Set regenerate=True to bypass the response and semantic caches and ask the LLM again.
+        """
+        profile = self._profile(resume_text)
+        inputs, metrics = self._prompt_inputs(job_details, profile, tone)
+
+        email, key = self._cached_completion(inputs, job_details, profile, tone, regenerate)
+        if email is None:
+            prompt = EMAIL_TEMPLATE.format(**inputs)
+            with self._llm_span('single', inputs, metrics) as trace:
+                message = call_with_backoff_blocking(
+                    self.rate_limiter, lambda: self.llm.invoke(prompt),
+                    self._prompt_tokens(inputs, metrics) + EXPECTED_COMPLETION_TOKENS
+                )
+                email = getattr(message, "content", message)
+                trace.set(completion_tokens=self._count_tokens(email))
+            self._store_completion(key, inputs, job_details, profile, tone, email)
+
+        return trim_sign_off(email) + self._build_signature(profile.contact_details)
+
+    def stream_email(self, job_details, resume_text, tone, regenerate=False, on_metrics=None):
         """
+        Same as generate_email, but yields the email in pieces as the LLM produces
+        tokens. The sign-off is trimmed incrementally and the signature comes last.
+        on_metrics, if given, is called with this request's prompt metrics.
+        """
+        profile = self._profile(resume_text)
+        inputs, metrics = self._prompt_inputs(job_details, profile, tone)
+        if on_metrics is not None:
+            on_metrics(metrics)
+
+        email, key = self._cached_completion(inputs, job_details, profile, tone, regenerate)
+        if email is not None:
+            yield trim_sign_off(email)
+        else:
+            trimmer = SignOffTrimmer()
+            chunks = []
+            with self._llm_span('stream', inputs, metrics) as trace:
+                stream = call_with_backoff_blocking(
+                    self.rate_limiter, lambda: self._open_stream(EMAIL_TEMPLATE.format(**inputs)),
+                    self._prompt_tokens(inputs, metrics) + EXPECTED_COMPLETION_TOKENS
+                )
+                for chunk in stream:
+                    text = getattr(chunk, "content", chunk)
+                    if not text:
+                        continue
+                    chunks.append(text)
+                    ready = trimmer.feed(text)
+                    if ready:
+                        yield ready
+                trace.set(completion_tokens=self._count_tokens(''.join(chunks)))
+            rest = trimmer.finish()
+            if rest:
+                yield rest
+            self._store_completion(key, inputs, job_details, profile, tone, ''.join(chunks))
+
+        yield self._build_signature(profile.contact_details)
+
+    def _open_stream(self, prompt):
+        """
+        Start a streamed completion and wait for its first chunk. The request is
+        only sent when the stream is first read, so a 429 surfaces here, where
+        it can still be retried, rather than halfway through the email.
+        """
+        stream = iter(self.llm.stream(prompt))
+        first = next(stream, None)
+        return stream if first is None else itertools.chain([first], stream)
+
+    async def agenerate_emails(self, jobs, resume_text, tone, regenerate=False):
+        """
+        Generate emails for several jobs concurrently. Calls go through the shared
+        rate limiter (retrying 429s with backoff); results are yielded as they
+        complete as {'job', 'email', 'error', 'prompt_metrics'} dicts.
+        """
+        # Contact details and the signature are the same for every job
+        profile = self._profile(resume_text)
+        signature = self._build_signature(profile.contact_details)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def generate(job_details):
+            metrics = None
+            try:
+                inputs, metrics = self._prompt_inputs(job_details, profile, tone)
+                email, key = await asyncio.to_thread(
+                    self._cached_completion, inputs, job_details, profile, tone, regenerate
+                )
+                if email is None:
+                    prompt = EMAIL_TEMPLATE.format(**inputs)
+                    tokens = self._prompt_tokens(inputs, metrics)
+                    async with semaphore:
+                        with self._llm_span('batch', inputs, metrics) as trace:
+                            message = await call_with_backoff(
+                                self.rate_limiter, lambda: self.llm.ainvoke(prompt),
+                                tokens + EXPECTED_COMPLETION_TOKENS
+                            )
+                            email = getattr(message, "content", message)
+                            trace.set(completion_tokens=self._count_tokens(email))
+                    await asyncio.to_thread(
+                        self._store_completion, key, inputs, job_details, profile, tone, email
+                    )
+                return {'job': job_details, 'email': trim_sign_off(email) + signature, 'error': None,
+                        'prompt_metrics': metrics}
+            except Exception as e:
+                print(f"Error generating email for {job_details.get('url', job_details.get('title'))}: {e}")
+                return {'job': job_details, 'email': None, 'error': e, 'prompt_metrics': metrics}
+
+        tasks = [asyncio.ensure_future(generate(job_details)) for job_details in jobs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def generate_emails(self, jobs, resume_text, tone, regenerate=False):
+        """Blocking version of agenerate_emails; yields results as they complete"""
+        results = queue.Queue()
+        finished = object()
+        # The coroutine runs on the loop thread; carry the caller's span over so the LLM spans join its trace
+        parent = current_span()
+
+        async def consume():
+            try:
+                with use_span(parent):
+                    async for result in self.agenerate_emails(jobs, resume_text, tone, regenerate):
+                        results.put(result)
+            finally:
+                results.put(finished)
+
+        future = asyncio.run_coroutine_threadsafe(consume(), get_background_loop())
+        try:
+            while True:
+                result = results.get()
+                if result is finished:
+                    break
+                yield result
+        finally:
+            future.cancel()
+        # Surface errors raised outside the per-job handling
+        if not future.cancelled():
+            future.result()
+
+    def _llm_span(self, mode, inputs, metrics):
+        """Trace span for one LLM call, carrying this request's prompt metrics"""
+        attributes = {'prompt_tokens': self._prompt_tokens(inputs, metrics)}
+        if metrics:
+            attributes.update(original_tokens=metrics['original_tokens'], tokens_saved=metrics['tokens_saved'])
+        return span('llm', mode=mode, **attributes)
+
+    def _prompt_tokens(self, inputs, metrics):
+        if metrics:
+            return metrics['prompt_tokens']
+        return self._count_tokens(EMAIL_TEMPLATE.format(**inputs))
+
+    def _count_tokens(self, text):
+        if self.prompt_builder is not None:
+            return self.prompt_builder.count_tokens(text or "")
+        return len(text or "") // 4
+
+    def _prompt_inputs(self, job_details, profile, tone):
+        """Template inputs for one job, compacted to the token budget, and the prompt metrics"""
         skills = ", ".join(job_details['primary_skills'])
         
-        # Extract all contact details
-        contact_details = self.extract_contact_details(resume_text)
-        
-        email = self.chain.run({
+        inputs = {
             "job_title": job_details['title'],
             "company": job_details['company'],
             "skills": skills,
             "experience": job_details['experience'],
-            "resume": resume_text,
+            "resume": profile.text,
             "tone": tone
-        })
-        
-        # Find the position of "sincerely" and replace everything after it
-        sincerely_index = email.lower().rfind("sincerely")
-        if sincerely_index != -1:
-            email = email[:sincerely_index].strip()
+        }
+        if self.prompt_builder is None:
+            return inputs, None
+        return self.prompt_builder.build(EMAIL_TEMPLATE, inputs, job_details['primary_skills'], profile.sections)
 
+    def _build_signature(self, contact_details):
         # Create a professional signature with all available contact details
         signature = "\n\nBest Regards,\n"
         
@@ -236,6 +567,35 @@ class EmailGenerator:
             contact_lines.append(f"Portfolio: {contact_details['portfolio']}")
         
         signature += '\n'.join(contact_lines)
-        
-        email += signature
-        return email 
+        return signature
+
+    def _cached_completion(self, inputs, job_details, profile, tone, regenerate=False):
+        """
+        Look the prompt up in the response cache, then (when configured) the semantic
+        cache. Returns (email or None, response cache key).
+        """
+        key = None
+        with span('llm_cache') as trace:
+            if self.response_cache is not None:
+                # The template is a plain format string, so rendering it does not need langchain
+                key = self.response_cache.make_key(self.model_name, EMAIL_TEMPLATE.format(**inputs))
+                if not regenerate:
+                    email = self.response_cache.get(key)
+                    if email is not None:
+                        trace.set(cache='response', cache_hit=True)
+                        return email, key
+
+            if self.semantic_cache is not None and not regenerate:
+                email = self.semantic_cache.lookup(job_details, profile, tone)
+                if email is not None:
+                    trace.set(cache='semantic', cache_hit=True)
+                    return email, key
+
+            trace.set(cache='miss', cache_hit=False)
+            return None, key
+
+    def _store_completion(self, key, inputs, job_details, profile, tone, email):
+        if key is not None:
+            self.response_cache.set(key, email)
+        if self.semantic_cache is not None:
+            self.semantic_cache.store(job_details, profile, tone, email)
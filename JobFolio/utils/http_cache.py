@@ -0,0 +1,60 @@
+import os
+import time
+from typing import Dict, Optional
+
+import requests
+
+from utils.disk_cache import CACHE_ROOT, DiskCache
+
+
+class OfflineCacheMiss(requests.RequestException):
+    """Raised in offline mode when a URL has never been cached"""
+
+
+class ResponseCache:
+    """
+    On-disk cache of scraped pages keyed by canonical URL.
+    Entries keep their ETag / Last-Modified validators so that expired pages
+    can be revalidated with a conditional GET instead of downloaded again.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: float = 3600, max_bytes: int = 200 * 1024 * 1024):
+        self.ttl = ttl
+        # TTL kontrolü burada yapılır; süresi dolan kayıtlar yeniden doğrulama için diskte kalır
+        self.store = DiskCache(directory or os.path.join(CACHE_ROOT, "http"), ttl=None, max_bytes=max_bytes)
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        entry = self.store.get(url)
+        if not entry:
+            return None
+        cached = dict(entry['value'])
+        cached['stored_at'] = entry['stored_at']
+        return cached
+
+    def is_fresh(self, cached: Dict) -> bool:
+        return time.time() - cached.get('stored_at', 0) < self.ttl
+
+    def conditional_headers(self, cached: Dict) -> Dict[str, str]:
+        headers = {}
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+
+    def save(self, url: str, response: requests.Response) -> None:
+        if 'no-store' in response.headers.get('Cache-Control', '').lower():
+            return
+        self.store.set(url, {
+            'url': response.url,
+            'text': response.text,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        })
+
+    def revalidated(self, url: str, cached: Dict, response: requests.Response) -> None:
+        """Refresh an entry after a 304 Not Modified, keeping the stored body"""
+        value = {key: cached.get(key) for key in ('url', 'text', 'etag', 'last_modified')}
+        value['etag'] = response.headers.get('ETag') or value['etag']
+        value['last_modified'] = response.headers.get('Last-Modified') or value['last_modified']
+        self.store.set(url, value)
@@ -0,0 +1,78 @@
+import importlib.util
+import threading
+from typing import Dict, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def _supported_encodings() -> str:
+    """Advertise brotli only when urllib3 can actually decode it"""
+    encodings = ['gzip', 'deflate']
+    if importlib.util.find_spec('brotli') or importlib.util.find_spec('brotlicffi'):
+        encodings.append('br')
+    return ', '.join(encodings)
+
+
+ACCEPT_ENCODING = _supported_encodings()
+
+# Streamlit her etkileşimde scripti yeniden çalıştırır; modül seviyesindeki bu sözlük
+# sayesinde aynı ayarlarla oluşturulan scraper'lar aynı bağlantı havuzunu paylaşır.
+_shared_sessions: Dict[Tuple, requests.Session] = {}
+_shared_sessions_lock = threading.Lock()
+
+
+# Sayfa içeriğini değiştirmeyen kampanya / izleme parametreleri
+TRACKING_PARAMS = frozenset([
+    'gclid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    '_hsenc', '_hsmi', 'trk', 'trkinfo', 'gh_src', 'lever-source', 'lever-origin'
+])
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL (case, default port, fragment, query order, tracking params) so equivalent spellings match"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    port = parts.port
+    if port and not ((scheme == 'http' and port == 80) or (scheme == 'https' and port == 443)):
+        host = f"{host}:{port}"
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ))
+    return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+
+def build_session(headers: Dict[str, str], pool_connections: int = 10, pool_maxsize: int = 10,
+                  max_retries: int = 0) -> requests.Session:
+    """Create a keep-alive session whose connection pool is bounded per host"""
+    session = requests.Session()
+    session.headers.update(headers)
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    session.headers['Connection'] = 'keep-alive'
+
+    # pool_connections: kaç farklı host için havuz tutulacağı
+    # pool_maxsize: her host için açık tutulacak en fazla bağlantı sayısı
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=max_retries,
+        pool_block=True
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_shared_session(headers: Dict[str, str], pool_connections: int = 10, pool_maxsize: int = 10,
+                       max_retries: int = 0) -> requests.Session:
+    """Return a process-wide session for the given configuration, creating it on first use"""
+    key = (tuple(sorted(headers.items())), pool_connections, pool_maxsize, max_retries)
+    with _shared_sessions_lock:
+        session = _shared_sessions.get(key)
+        if session is None:
+            session = build_session(headers, pool_connections, pool_maxsize, max_retries)
+            _shared_sessions[key] = session
+        return session
@@ -0,0 +1,98 @@
+import importlib.util
+from typing import Dict, Iterable, Optional
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+SKILL_SECTION_CLASSES = frozenset(['requirements', 'qualifications', 'job-skills', 'skills-list', 'job-qualifications'])
+LOCATION_CLASSES = frozenset(['location', 'job-location'])
+
+# İçeriği ilan metni olmayan etiketler; bu alt ağaçlara hiç inilmez
+DEFAULT_SKIP_TAGS = frozenset(['script', 'style', 'noscript', 'template', 'svg', 'iframe'])
+
+
+def default_parser_backend() -> str:
+    """Prefer lxml when it is installed; it builds the tree several times faster than html.parser"""
+    return 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+
+class JobPostingParser:
+    """
+    Extracts title, company, location, skills, experience and education
+    from a job posting in a single walk over the document tree.
+    """
+
+    def __init__(self, backend: Optional[str] = None, skip_tags: Iterable[str] = DEFAULT_SKIP_TAGS):
+        self.backend = backend or default_parser_backend()
+        self.skip_tags = frozenset(skip_tags)
+
+    def parse(self, html: str) -> Dict:
+        return self.parse_soup(BeautifulSoup(html, self.backend))
+
+    def parse_soup(self, soup: BeautifulSoup) -> Dict:
+        title = None
+        company = None
+        location = None
+        experience = None
+        education = None
+        section_items = []
+        all_items = []
+
+        # (düğüm, bir beceri bölümünün içinde mi) çiftleriyle yinelemeli derinlik öncelikli gezinti
+        stack = [(child, False) for child in reversed(soup.contents)]
+        while stack:
+            node, in_section = stack.pop()
+
+            if isinstance(node, Tag):
+                name = node.name
+                if name in self.skip_tags:
+                    continue
+
+                classes = node.get('class') or ()
+                if name == 'h1':
+                    if title is None:
+                        title = node
+                elif name == 'meta':
+                    if company is None and node.get('property') == 'og:site_name':
+                        company = node.get('content', '')
+                elif name == 'li':
+                    all_items.append(node)
+                    if in_section:
+                        section_items.append(node)
+
+                if classes:
+                    if location is None and not LOCATION_CLASSES.isdisjoint(classes):
+                        location = node
+                    if not in_section and not SKILL_SECTION_CLASSES.isdisjoint(classes):
+                        in_section = True
+
+                if node.contents:
+                    stack.extend((child, in_section) for child in reversed(node.contents))
+
+            elif type(node) is NavigableString and (experience is None or education is None):
+                lowered = node.lower()
+                if experience is None and 'experience' in lowered:
+                    experience = node
+                if education is None and 'education' in lowered:
+                    education = node
+
+        # Bilinen bölümlerde madde yoksa sayfadaki tüm <li>'lere düşülür
+        skills = self._item_texts(section_items) or self._item_texts(all_items)
+
+        return {
+            'title': title.text.strip() if title is not None else "",
+            'company': company or "",
+            'location': location.text.strip() if location is not None else "",
+            'primary_skills': skills,
+            'secondary_skills': list(skills),
+            'experience': experience.strip() if experience is not None else "",
+            'education': education.strip() if education is not None else ""
+        }
+
+    @staticmethod
+    def _item_texts(items) -> list:
+        texts = []
+        for item in items:
+            text = item.text.strip()
+            if text:
+                texts.append(text)
+        return texts
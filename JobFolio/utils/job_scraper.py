@@ -1,170 +1,493 @@
 import requests
 from bs4 import BeautifulSoup
-from typing import Dict, Optional, List
-import selenium
-import os
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
+from typing import Dict, Iterator, NamedTuple, Optional, List, Sequence, Tuple, Union
+import hashlib
+import heapq
+import json
+import threading
 import time
-from urllib.parse import urljoin
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urljoin, urlparse
+from utils.http_client import canonical_url, get_shared_session
+from utils.http_cache import OfflineCacheMiss, ResponseCache
+from utils.job_parser import JobPostingParser
+from utils.posting_store import PostingStore
+from utils.strategy_store import BROWSER, STATIC, STRUCTURED, DomainStrategyStore
+from utils.resume_profile import ResumeProfile, resume_index_of, resume_text_of
+from utils.skill_matcher import ResumeIndex
+from utils.tracing import annotate, bind, span
+
+# Dinamik sayfalarda iş ilanı linki sayılan URL parçaları
+LINK_KEYWORDS = ['job', 'jobs', 'career', 'details', 'recruit', 'ilan', 'position', 'jobdetail', 'jobads']
+
+# Başlık bilgisi taşımayan bağlantı metinleri; bunlar indirmeden önce elenmez
+GENERIC_ANCHOR_TEXTS = frozenset([
+    'apply', 'apply now', 'view', 'view job', 'view details', 'details', 'see details', 'more',
+    'learn more', 'read more', 'more info', 'open', 'incele', 'detaylar', 'başvur'
+])
+
+# Sayfalamayı izleyen taramalar ilanları "<url>#paginated" anahtarı altında kaydeder
+PAGINATED_LISTING_SUFFIX = '#paginated'
+
+
+class JobLink(NamedTuple):
+    url: str
+    text: str = ''
 
 
 class JobScraper:
-    def __init__(self):
+    def __init__(self, max_workers: int = 8, per_host_limit: int = 4, pool_connections: int = 10,
+                 pool_maxsize: Optional[int] = None, timeout: float = 15, session: Optional[requests.Session] = None,
+                 use_cache: bool = True, cache_dir: Optional[str] = None, cache_ttl: float = 3600,
+                 cache_max_bytes: int = 200 * 1024 * 1024, offline: bool = False,
+                 parser_backend: Optional[str] = None, chromedriver_path: Optional[str] = None,
+                 browser_pool_size: int = 2, browser_max_uses: int = 20,
+                 strategy_store: Optional[DomainStrategyStore] = None, incremental: bool = False,
+                 posting_store: Optional[PostingStore] = None, recheck_after: float = 12 * 3600):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        # Tüm istekler aynı keep-alive oturumu üzerinden gider (TCP/TLS el sıkışması bir kez ödenir)
+        self.timeout = timeout
+        self.session = session or get_shared_session(
+            self.headers,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize or max(per_host_limit, max_workers)
+        )
+        # offline=True: ağa hiç çıkmadan yalnızca önbellekteki sayfalar kullanılır
+        self.offline = offline
+        self.cache = ResponseCache(cache_dir, ttl=cache_ttl, max_bytes=cache_max_bytes) if (use_cache or offline) else None
+        self.parser = JobPostingParser(backend=parser_backend)
+        # Selenium fallback'i için sıcak tarayıcı havuzu; ilk ihtiyaçta oluşturulur
+        self.chromedriver_path = chromedriver_path
+        self.browser_pool_size = browser_pool_size
+        self.browser_max_uses = browser_max_uses
+        self._browser_pool = None
+        # Alan adı başına öğrenilen link çıkarma stratejisi (statik / tarayıcı / yapısal uç nokta)
+        self.strategies = strategy_store or DomainStrategyStore()
+        # Detay sayfaları paralel çekilir; aynı siteye aynı anda en fazla per_host_limit istek gider
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+        # Artımlı tarama: bilinen ilanlar recheck_after süresince depodan okunur,
+        # sonra yeniden indirilir ve içerik özeti değişmediyse yeniden ayrıştırılmaz
+        self.postings = (posting_store or PostingStore()) if incremental else None
+        self.recheck_after = recheck_after
+        self.incremental_stats = {'fetched': 0, 'unchanged': 0, 'from_store': 0}
+        self._stats_lock = threading.Lock()
 
     def extract_job_links(self, listing_url: str) -> List[str]:
+        return [link.url for link in self.extract_job_link_records(listing_url)]
 
-
+    def extract_job_link_records(self, listing_url: str) -> List[JobLink]:
+        """Return the postings on a listing page as (canonical url, anchor text) records"""
+        domain = urlparse(listing_url).netloc.lower()
         job_links = []
 
-        try:
-            # Statik HTML (Nike gibi siteler)
-            response = requests.get(listing_url, headers=self.headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            for a in soup.find_all('a', href=True):
-                href = a['href']
-                if '/job/' in href:
-                    full_url = requests.compat.urljoin(listing_url, href)
-                    if full_url not in job_links:
-                        job_links.append(full_url)
-
-            # Eğer job link bulunamazsa → Selenium fallback
-            if not job_links:
-                print("Falling back to Selenium for dynamic content...")
-
-                # 🧠 Proje dizinindeki chromedriver.exe yolunu al
-                chromedriver_path = os.path.join(os.getcwd(), "chromedriver.exe")
-
-                options = Options()
-                options.add_argument('--headless')
-                options.add_argument('--disable-gpu')
-                options.add_argument('--no-sandbox')
-
-                driver = webdriver.Chrome(service=Service(executable_path=chromedriver_path), options=options)
-
-                driver.get(listing_url)
-                time.sleep(5)  # Sayfanın yüklenmesini bekle
-
-                # Sayfayı aşağı kaydır (Baykar gibi dinamik yüklenen siteler için)
-                last_height = driver.execute_script("return document.body.scrollHeight")
-                for _ in range(3):
-                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
-                    new_height = driver.execute_script("return document.body.scrollHeight")
-                    if new_height == last_height:
+        with span('link_extract', url=listing_url) as trace:
+            # Bu alan adı için daha önce işe yarayan yol biliniyorsa doğrudan onu dene
+            learned = self.strategies.get(domain)
+            if learned:
+                try:
+                    job_links, _ = self._links_with_strategy(listing_url, learned['strategy'], learned['heuristic'])
+                except Exception as e:
+                    print(f"Error extracting job links: {e}")
+                if job_links:
+                    trace.set(strategy=learned['strategy'], links=len(job_links))
+                    self.sync_listing(listing_url, job_links)
+                    return job_links
+                print(f"Learned strategy for {domain} returned no links, probing again...")
+                self.strategies.forget(domain)
+
+            for strategy in (STRUCTURED, STATIC, BROWSER):
+                if strategy == BROWSER:
+                    if self.offline:
                         break
-                    last_height = new_height
-
-                # Tüm linkleri al
-                elements = driver.find_elements(By.TAG_NAME, 'a')
-                for a in elements:
-                    href = a.get_attribute('href')
-                    if href and any(keyword in href.lower() for keyword in ['job', 'jobs', 'career', 'details', 'recruit', 'ilan', 'position', 'jobdetail', 'jobads']):
-                                full_url = urljoin(listing_url, href)
-                                if full_url not in job_links:
-                                    job_links.append(full_url)
-
-                driver.quit()
-
-        except Exception as e:
-            print(f"Error extracting job links: {e}")
-
-        return job_links
+                    print("Falling back to Selenium for dynamic content...")
+                try:
+                    job_links, heuristic = self._links_with_strategy(listing_url, strategy)
+                except Exception as e:
+                    print(f"Error extracting job links: {e}")
+                    continue
+                if job_links:
+                    trace.set(strategy=strategy)
+                    self.strategies.remember(domain, strategy, heuristic)
+                    break
 
+            trace.set(links=len(job_links))
+            self.sync_listing(listing_url, job_links)
+            return job_links
+
+    def sync_listing(self, listing_url: str, job_links: List[JobLink], paginated: bool = False) -> None:
+        """
+        Incremental mode: record the listing's current postings and mark vanished ones stale.
+        A paginated crawl is kept under its own key, so a later single-page scan of the
+        same URL does not mark the postings of the other pages stale.
+        """
+        if self.postings is None or not job_links:
+            return
+        listing = canonical_url(listing_url) + (PAGINATED_LISTING_SUFFIX if paginated else '')
+        counts = self.postings.sync_listing(listing, job_links)
+        print(f"Listing sync: {counts['new']} new, {counts['changed']} changed, {counts['stale']} now stale")
+
+    def filter_job_links(self, job_links: Sequence[Union[str, JobLink]],
+                         target_keywords: List[str] = None) -> List[Union[str, JobLink]]:
+        """
+        Drop postings whose anchor text is a real title without any target keyword,
+        before any detail page is downloaded. Links without usable text are kept;
+        their title is still checked after the fetch.
+        """
+        if not target_keywords:
+            return list(job_links)
+        keywords = [keyword.lower() for keyword in target_keywords]
+        kept = []
+        for link in job_links:
+            text = link.text.lower().strip() if isinstance(link, JobLink) else ''
+            if not text or text in GENERIC_ANCHOR_TEXTS or any(keyword in text for keyword in keywords):
+                kept.append(link)
+        return kept
+
+    def _links_with_strategy(self, listing_url: str, strategy: str, heuristic: Optional[str] = None):
+        """Run one link-extraction strategy, returning (links, heuristic that produced them)"""
+        with span('link_strategy', strategy=strategy) as trace:
+            if strategy == STRUCTURED:
+                links, heuristic = self._structured_links(listing_url, heuristic)
+            elif strategy == STATIC:
+                links, heuristic = self._static_links(listing_url, heuristic)
+            elif strategy == BROWSER:
+                links, heuristic = self._browser_links(listing_url)
+            else:
+                links, heuristic = [], None
+            trace.set(links=len(links))
+            return links, heuristic
+
+    def _structured_links(self, listing_url: str, heuristic: Optional[str] = None):
+        """Read postings from a known ATS JSON API instead of scraping the listing page"""
+        parts = urlparse(listing_url)
+        host = parts.netloc.lower()
+        board = parts.path.strip('/').split('/')[0] if parts.path.strip('/') else ''
+        if not board:
+            return [], None
+
+        if host.endswith('greenhouse.io') and heuristic in (None, 'greenhouse_api'):
+            data = json.loads(self._fetch(f"https://boards-api.greenhouse.io/v1/boards/{board}/jobs"))
+            links = self._unique_links(
+                (job.get('absolute_url'), job.get('title')) for job in data.get('jobs', [])
+            )
+            return links, 'greenhouse_api'
+
+        if host == 'jobs.lever.co' and heuristic in (None, 'lever_api'):
+            data = json.loads(self._fetch(f"https://api.lever.co/v0/postings/{board}?mode=json"))
+            links = self._unique_links((posting.get('hostedUrl'), posting.get('text')) for posting in data)
+            return links, 'lever_api'
+
+        return [], None
+
+    def _static_links(self, listing_url: str, heuristic: Optional[str] = None):
+        # Statik HTML (Nike gibi siteler)
+        return self.listing_page_links(listing_url, heuristic)[:2]
+
+    def listing_page_links(self, listing_url: str, heuristic: Optional[str] = None):
+        """
+        Fetch one listing page and apply the static link heuristics to it.
+        Returns (links, heuristic that produced them, parsed page) so callers such
+        as the pagination crawler can look for further pages in the same soup.
+        """
+        html = self._fetch(listing_url)
+        with span('parse', kind='listing'):
+            soup = BeautifulSoup(html, self.parser.backend)
+
+        if heuristic in (None, 'job_path'):
+            links = self._unique_links(
+                (urljoin(listing_url, a['href']), a.get_text(' ', strip=True))
+                for a in soup.find_all('a', href=True) if '/job/' in a['href']
+            )
+            if links:
+                return links, 'job_path', soup
+
+        # Sayfaya gömülü schema.org JobPosting / ItemList verisi
+        if heuristic in (None, 'json_ld'):
+            links = self._unique_links(
+                (urljoin(listing_url, url), title) for url, title in self._json_ld_job_urls(soup)
+            )
+            if links:
+                return links, 'json_ld', soup
+
+        return [], None, soup
+
+    def _browser_links(self, listing_url: str):
+        from utils.browser_pool import collect_rendered_links
+
+        with span('browser_render'):
+            with self.browser_pool.lease() as driver:
+                rendered_links = collect_rendered_links(driver, listing_url)
+
+        # Tüm linkleri al
+        links = self._unique_links(
+            (urljoin(listing_url, href), text) for href, text in rendered_links
+            if href and any(keyword in href.lower() for keyword in LINK_KEYWORDS)
+        )
+        return links, 'keyword'
+
+    @staticmethod
+    def _json_ld_job_urls(soup) -> List[Tuple[str, str]]:
+        urls = []
+        for script in soup.find_all('script', type='application/ld+json'):
+            try:
+                data = json.loads(script.string or '')
+            except ValueError:
+                continue
+            stack = [data]
+            while stack:
+                item = stack.pop()
+                if isinstance(item, list):
+                    stack.extend(reversed(item))
+                elif isinstance(item, dict):
+                    item_type = item.get('@type')
+                    if item_type == 'JobPosting' and isinstance(item.get('url'), str):
+                        urls.append((item['url'], item.get('title') or ''))
+                    elif item_type == 'ListItem' and isinstance(item.get('url'), str):
+                        urls.append((item['url'], item.get('name') or ''))
+                    for key in ('@graph', 'itemListElement', 'item'):
+                        if key in item:
+                            stack.append(item[key])
+        return urls
+
+    @staticmethod
+    def _unique_links(candidates) -> List[JobLink]:
+        """De-duplicate (url, text) pairs by canonical URL in insertion order"""
+        job_links: Dict[str, str] = {}
+        for url, text in candidates:
+            if not url:
+                continue
+            url = canonical_url(url)
+            text = ' '.join((text or '').split())
+            if url not in job_links or (text and not job_links[url]):
+                job_links[url] = text
+        return [JobLink(url, text) for url, text in job_links.items()]
+
+    @property
+    def browser_pool(self):
+        if self._browser_pool is None:
+            # Selenium yalnızca dinamik bir sayfa ilk kez gerektiğinde içe aktarılır
+            from utils.browser_pool import get_shared_browser_pool
+
+            self._browser_pool = get_shared_browser_pool(
+                self.chromedriver_path, size=self.browser_pool_size, max_uses=self.browser_max_uses
+            )
+        return self._browser_pool
+
+    def _fetch(self, url: str) -> str:
+        """GET a page through the response cache, revalidating stale entries with a conditional request"""
+        # bytes: indirilen gövde boyutu; önbellekten dönen sayfalarda 0
+        with span('fetch', url=url) as trace:
+            if self.cache is None:
+                response = self.session.get(url, timeout=self.timeout)
+                response.raise_for_status()
+                trace.set(cache='disabled', cache_hit=False, bytes=len(response.content))
+                return response.text
+
+            key = canonical_url(url)
+            cached = self.cache.lookup(key)
+            if cached and (self.offline or self.cache.is_fresh(cached)):
+                trace.set(cache='fresh', cache_hit=True)
+                return cached['text']
+            if self.offline:
+                raise OfflineCacheMiss(f"{url} is not in the offline cache")
+
+            headers = self.cache.conditional_headers(cached) if cached else {}
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and cached:
+                trace.set(cache='revalidated', cache_hit=True)
+                self.cache.revalidated(key, cached, response)
+                return cached['text']
+            response.raise_for_status()
+            trace.set(cache='miss', cache_hit=False, bytes=len(response.content))
+            self.cache.save(key, response)
+            return response.text
 
     def extract_job_details(self, url: str) -> Optional[Dict]:
+        with span('job_details', url=url):
+            try:
+                if self.postings is not None:
+                    return self._stored_job_details(url) or self._fetch_job_details_incremental(url)
+
+                html = self._fetch(url)
+                with span('parse', kind='posting', chars=len(html)):
+                    return self.parser.parse(html)
+
+            except Exception as e:
+                annotate(outcome='error')
+                print(f"Error scraping job details: {str(e)}")
+                return None
+
+    def match_job_to_resume(self, job_details: Dict, resume: Union[str, ResumeProfile, ResumeIndex]) -> float:
+        """Weighted skill overlap: 1 per skill phrase found in the resume, partial credit for partial matches"""
+        return resume_index_of(resume).score(job_details.get("primary_skills", []))
+
+    def find_best_matching_job(self, job_links: Sequence[Union[str, JobLink]], resume_text: Union[str, ResumeProfile],
+                               target_keywords: List[str] = None, concurrent: bool = True) -> Optional[Dict]:
+        ranking = []
+        for progress in self.iter_matching_jobs(job_links, resume_text, top_k=1,
+                                                target_keywords=target_keywords, concurrent=concurrent):
+            ranking = progress['ranking']
+        return ranking[0] if ranking else None
+
+    def iter_matching_jobs(self, job_links: Sequence[Union[str, JobLink]], resume_text: Union[str, ResumeProfile],
+                           top_k: int = 3, target_keywords: List[str] = None, time_budget: Optional[float] = None,
+                           max_fetches: Optional[int] = None, concurrent: bool = True) -> Iterator[Dict]:
+        """
+        Stream the scan: postings are fetched, parsed and scored as they arrive, and after
+        each one a progress dict is yielded with the current top_k ranking
+        ({'ranking', 'fetched', 'total', 'done'}). The scan stops early once time_budget
+        seconds have passed or max_fetches postings were fetched.
+        """
+        links = self._link_urls(self.filter_job_links(job_links, target_keywords))
+        if max_fetches is not None:
+            links = links[:max_fetches]
+        resume_index = resume_index_of(resume_text)
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+
+        # (skor, -sıra, iş) min-heap'i: eşit skorlarda listede önce gelen ilan kalır
+        heap = []
+        fetched = 0
+        for index, link, job in self._iter_job_details(links, concurrent, deadline):
+            fetched += 1
+            if job:
+                title = job.get('title', '').lower()
+                if not target_keywords or any(keyword in title for keyword in target_keywords):
+                    with span('match'):
+                        score = self.match_job_to_resume(job, resume_index)
+                    print(f"📝 Checking: {job.get('title')} | Score: {score:.2f} | URL: {link}")
+                    if score > 0:
+                        job['url'] = link
+                        job['score'] = score
+                        entry = (score, -index, job)
+                        if len(heap) < top_k:
+                            heapq.heappush(heap, entry)
+                        elif entry[:2] > heap[0][:2]:
+                            heapq.heapreplace(heap, entry)
+            yield self._scan_progress(heap, fetched, len(links), done=False)
+
+        yield self._scan_progress(heap, fetched, len(links), done=True)
+
+    @staticmethod
+    def _scan_progress(heap, fetched: int, total: int, done: bool) -> Dict:
+        ranking = [job for _, _, job in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
+        return {'ranking': ranking, 'fetched': fetched, 'total': total, 'done': done}
+
+    def _iter_job_details(self, links: List[str], concurrent: bool, deadline: Optional[float]):
+        """Yield (index, link, details) as postings finish, stopping at the deadline"""
+        if not (concurrent and self.max_workers > 1 and len(links) > 1):
+            for index, link in enumerate(links):
+                if deadline is not None and time.monotonic() >= deadline:
+                    return
+                yield index, link, self.extract_job_details(link)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(links)))
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            job_details = {
-                'title': self._extract_text(soup, 'h1'),
-                'company': self._extract_company(soup),
-                'location': self._extract_location(soup),
-                'primary_skills': self._extract_skills(soup, primary=True),
-                'secondary_skills': self._extract_skills(soup, primary=False),
-                'experience': self._extract_experience(soup),
-                'education': self._extract_education(soup)
-            }
-
-            return job_details
-
-        except Exception as e:
-            print(f"Error scraping job details: {str(e)}")
-            return None
-
-    def match_job_to_resume(self, job_details: Dict, resume_text: str) -> int:
-        resume_lower = resume_text.lower()
-        matched = 0
-        for skill in job_details.get("primary_skills", []):
-            skill_words = skill.lower().split()  # tek kelimeden eşleşme
-            for word in skill_words:
-                if word in resume_lower:
-                    matched += 1
-                    break
-        return matched
-
-    def find_best_matching_job(self, job_links: List[str], resume_text: str, target_keywords: List[str] = None) -> Optional[Dict]:
-        best_job = None
-        best_score = 0
-        for link in job_links:
-            job = self.extract_job_details(link)
+            # İş parçacıkları izleme bağlamını devralmaz; bind mevcut span'i taşır
+            extract = bind(self._extract_job_details_throttled)
+            pending = {executor.submit(extract, link): (index, link)
+                       for index, link in enumerate(links)}
+            while pending:
+                timeout = None
+                if deadline is not None:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        return
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, link = pending.pop(future)
+                    yield index, link, future.result()
+        finally:
+            # Tüketici erken durursa bekleyen indirmeler iptal edilir
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def rank_matching_jobs(self, job_links: Sequence[Union[str, JobLink]], resume_text: Union[str, ResumeProfile],
+                           top_k: int = 5, target_keywords: List[str] = None, concurrent: bool = True) -> List[Dict]:
+        """Fetch every posting and return the top_k by TF-IDF similarity to the resume, each with a 'score'"""
+        from utils.ranking import rank_jobs
+
+        job_links = self._link_urls(self.filter_job_links(job_links, target_keywords))
+        if concurrent and self.max_workers > 1 and len(job_links) > 1:
+            details = self._fetch_job_details_concurrently(job_links)
+        else:
+            details = [self.extract_job_details(link) for link in job_links]
+
+        jobs = []
+        for link, job in zip(job_links, details):
             if not job:
                 continue
             title = job.get('title', '').lower()
             if target_keywords and not any(keyword in title for keyword in target_keywords):
                 continue
-            score = self.match_job_to_resume(job, resume_text)  # 👈 self. kullanılmalı
-            print(f"📝 Checking: {job.get('title')} | Score: {score} | URL: {link}")
-            if score > best_score:
-                best_score = score
-                best_job = job
-                best_job['url'] = link
-        return best_job
-
-    def _extract_text(self, soup, selector):
-        element = soup.find(selector)
-        return element.text.strip() if element else ""
-
-    def _extract_company(self, soup):
-        company_element = soup.find('meta', {'property': 'og:site_name'})
-        return company_element['content'] if company_element else ""
-
-    def _extract_location(self, soup):
-        location_element = soup.find(class_=['location', 'job-location'])
-        return location_element.text.strip() if location_element else ""
-
-    def _extract_skills(self, soup, primary=True):
-        skills = []
-
-        # Öncelikle bilinen class'lara bak
-        possible_sections = soup.find_all(class_=['requirements', 'qualifications', 'job-skills', 'skills-list', 'job-qualifications'])
-
-        for section in possible_sections:
-            items = section.find_all('li')
-            skills.extend([item.text.strip() for item in items if item.text.strip()])
-
-        # Eğer hiçbir şey bulamadıysak, fallback: sayfadaki tüm <li>'leri oku
-        if not skills:
-            fallback_items = soup.find_all('li')
-            skills = [item.text.strip() for item in fallback_items if item.text.strip()]
-
-        return skills
-
-
-
-    def _extract_experience(self, soup):
-        experience_section = soup.find(text=lambda t: t and 'experience' in t.lower())
-        return experience_section.strip() if experience_section else ""
-
-    def _extract_education(self, soup):
-        education_section = soup.find(text=lambda t: t and 'education' in t.lower())
-        return education_section.strip() if education_section else ""
+            job['url'] = link
+            jobs.append(job)
+        return rank_jobs(jobs, resume_text_of(resume_text), top_k=top_k)
+
+    @staticmethod
+    def _link_urls(job_links: Sequence[Union[str, JobLink]]) -> List[str]:
+        return [link.url if isinstance(link, JobLink) else link for link in job_links]
+
+    def _fetch_job_details_concurrently(self, job_links: List[str]) -> List[Optional[Dict]]:
+        """Fetch and parse job postings in parallel, returning results in link order"""
+        workers = min(self.max_workers, len(job_links))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(bind(self._extract_job_details_throttled), job_links))
+
+    def _stored_job_details(self, url: str) -> Optional[Dict]:
+        """Details of a posting checked within recheck_after, served without any request"""
+        stored = self.postings.get(canonical_url(url))
+        if not stored or stored['details'] is None or time.time() - stored['checked_at'] >= self.recheck_after:
+            return None
+        self._count('from_store')
+        # Çağıranlar sözlüğe 'url' ve 'score' ekler; depodaki kopya değişmesin
+        return dict(stored['details'])
+
+    def _fetch_job_details_incremental(self, url: str) -> Optional[Dict]:
+        key = canonical_url(url)
+        html = self._fetch(url)
+        content_hash = hashlib.sha256(html.encode('utf-8')).hexdigest()
+        stored = self.postings.get(key)
+        if stored and stored['content_hash'] == content_hash and stored['details'] is not None:
+            self.postings.mark_checked(key)
+            self._count('unchanged')
+            return dict(stored['details'])
+
+        with span('parse', kind='posting', chars=len(html)):
+            details = self.parser.parse(html)
+        self.postings.save(key, content_hash, details)
+        self._count('fetched')
+        return details
+
+    def _count(self, outcome: str) -> None:
+        annotate(outcome=outcome)
+        with self._stats_lock:
+            self.incremental_stats[outcome] += 1
+
+    def _extract_job_details_throttled(self, url: str) -> Optional[Dict]:
+        # Depodan okunan ilanlar siteye istek atmaz; sıra beklemeleri gerekmez
+        if self.postings is not None:
+            with span('store_lookup', url=url) as trace:
+                try:
+                    stored = self._stored_job_details(url)
+                except Exception as e:
+                    print(f"Error reading stored posting: {e}")
+                    stored = None
+                trace.set(cache_hit=stored is not None)
+            if stored is not None:
+                return stored
+        with self._host_semaphore(url):
+            return self.extract_job_details(url)
+
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._host_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(max(1, self.per_host_limit))
+                self._host_semaphores[host] = semaphore
+            return semaphore
@@ -0,0 +1,273 @@
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+from utils.http_client import canonical_url
+from utils.job_scraper import JobLink
+from utils.tracing import bind, span
+
+# "Sonraki sayfa" bağlantılarının metinleri (küçük harf)
+NEXT_TEXTS = frozenset([
+    'next', 'next page', 'next »', 'next ›', '»', '›', '>', '>>', 'older', 'more jobs', 'load more',
+    'show more', 'see more jobs', 'sonraki', 'sonraki sayfa', 'ileri', 'daha fazla', 'daha fazla göster'
+])
+
+# Sayfa numarası taşıyan sorgu parametreleri
+PAGE_PARAMS = frozenset(['page', 'p', 'pg', 'paged', 'pagenumber', 'page_number', 'offset', 'start', 'from'])
+PAGE_PATH_PATTERN = re.compile(r"/(?:page|sayfa)/\d+/?$", re.IGNORECASE)
+
+# "Daha fazla yükle" düğmelerinin uç noktayı taşıdığı öznitelikler
+LOAD_MORE_ATTRIBUTES = ('data-next-url', 'data-next', 'data-url', 'data-href', 'data-load-more-url')
+
+
+def find_next_pages(soup, page_url: str) -> List[str]:
+    """Candidate pagination URLs on a listing page: rel=next, "next" anchors, load-more endpoints, page links"""
+    candidates = []
+    for tag in soup.find_all(['link', 'a'], rel=True, href=True):
+        if 'next' in [value.lower() for value in tag.get('rel', [])]:
+            candidates.append(tag['href'])
+
+    for anchor in soup.find_all('a', href=True):
+        href = anchor['href']
+        text = anchor.get_text(' ', strip=True).lower()
+        label = (anchor.get('aria-label') or '').lower()
+        if text in NEXT_TEXTS or label in ('next', 'next page'):
+            candidates.append(href)
+        elif _is_page_link(urljoin(page_url, href)):
+            candidates.append(href)
+
+    for attribute in LOAD_MORE_ATTRIBUTES:
+        for tag in soup.find_all(attrs={attribute: True}):
+            text = tag.get_text(' ', strip=True).lower()
+            if text in NEXT_TEXTS or 'more' in text or 'fazla' in text or attribute.startswith('data-next'):
+                candidates.append(tag[attribute])
+
+    pages = []
+    for href in candidates:
+        if not href or href.startswith(('#', 'javascript:', 'mailto:')):
+            continue
+        pages.append(canonical_url(urljoin(page_url, href)))
+    return list(dict.fromkeys(pages))
+
+
+def _is_page_link(url: str) -> bool:
+    parts = urlparse(url)
+    if PAGE_PATH_PATTERN.search(parts.path):
+        return True
+    return any(key.lower() in PAGE_PARAMS and value.isdigit() for key, value in parse_qsl(parts.query))
+
+
+class HostThrottle:
+    """Spaces requests to the same host at least `delay` seconds apart, across threads"""
+
+    def __init__(self, delay: float = 1.0):
+        self.delay = delay
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str, delay: Optional[float] = None) -> None:
+        delay = self.delay if delay is None else delay
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + delay
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_shared_throttle: Optional[HostThrottle] = None
+_shared_throttle_lock = threading.Lock()
+
+
+def get_shared_throttle() -> HostThrottle:
+    """Return the process-wide throttle, so concurrent crawls of one host are spaced together"""
+    global _shared_throttle
+    with _shared_throttle_lock:
+        if _shared_throttle is None:
+            _shared_throttle = HostThrottle()
+        return _shared_throttle
+
+
+class RobotsCache:
+    """
+    robots.txt per scheme and host, fetched once and kept for `ttl` seconds.
+    With a response cache the file is stored and revalidated like any page;
+    offline, only the cached copy is used and uncached sites are unrestricted.
+    """
+
+    def __init__(self, session, user_agent: str = '*', timeout: float = 10, ttl: float = 24 * 3600,
+                 cache=None, offline: bool = False):
+        self.session = session
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.ttl = ttl
+        self.cache = cache
+        self.offline = offline
+        self._parsers: Dict[str, Tuple[float, RobotFileParser]] = {}
+        self._lock = threading.Lock()
+
+    def parser(self, url: str) -> RobotFileParser:
+        parts = urlparse(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            cached = self._parsers.get(origin)
+            if cached and time.monotonic() - cached[0] < self.ttl:
+                return cached[1]
+
+        parser = RobotFileParser(origin + '/robots.txt')
+        try:
+            self._read(parser, origin + '/robots.txt')
+        except Exception as e:
+            # robots.txt okunamazsa site kısıtlamasız kabul edilir
+            print(f"Could not read robots.txt for {origin}: {e}")
+            parser.allow_all = True
+
+        with self._lock:
+            self._parsers[origin] = (time.monotonic(), parser)
+        return parser
+
+    def _read(self, parser: RobotFileParser, robots_url: str) -> None:
+        cached = self.cache.lookup(robots_url) if self.cache is not None else None
+        if cached and (self.offline or self.cache.is_fresh(cached)):
+            parser.parse(cached['text'].splitlines())
+            return
+        if self.offline:
+            # Çevrimdışı modda ağa çıkılmaz; önbellekte olmayan site kısıtlamasız kabul edilir
+            parser.allow_all = True
+            return
+
+        headers = self.cache.conditional_headers(cached) if cached else {}
+        response = self.session.get(robots_url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and cached:
+            self.cache.revalidated(robots_url, cached, response)
+            parser.parse(cached['text'].splitlines())
+        elif response.status_code in (401, 403):
+            parser.disallow_all = True
+        elif response.status_code >= 400:
+            parser.allow_all = True
+        else:
+            parser.parse(response.text.splitlines())
+            if self.cache is not None:
+                self.cache.save(robots_url, response)
+
+    def allowed(self, url: str) -> bool:
+        return self.parser(url).can_fetch(self.user_agent, url)
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        delay = self.parser(url).crawl_delay(self.user_agent)
+        return float(delay) if delay is not None else None
+
+
+class ListingCrawler:
+    """
+    Follows a listing's pagination through a bounded breadth-first frontier and
+    collects the postings of every page with the scraper's link heuristics.
+    Pages of one host are spaced by the throttle (or the robots.txt crawl
+    delay), disallowed pages are skipped, and at most max_concurrency pages
+    are fetched at once. The throttle is shared by every crawler in the
+    process unless one is passed in, so concurrent crawls of the same host
+    are spaced together. The crawl stops following pagination once
+    max_postings postings have been found.
+    """
+
+    def __init__(self, scraper, max_pages: int = 20, max_depth: int = 10, max_concurrency: int = 4,
+                 per_host_delay: float = 1.0, respect_robots: bool = True, max_postings: Optional[int] = None,
+                 throttle: Optional[HostThrottle] = None):
+        self.scraper = scraper
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.max_concurrency = max_concurrency
+        self.max_postings = max_postings
+        self.per_host_delay = per_host_delay
+        self.throttle = throttle or get_shared_throttle()
+        self.robots = RobotsCache(scraper.session, timeout=scraper.timeout, cache=scraper.cache,
+                                  offline=scraper.offline) if respect_robots else None
+
+    def crawl(self, start_url: str) -> List[JobLink]:
+        """Return the JobLinks found on start_url and the pages it paginates to"""
+        start_url = canonical_url(start_url)
+        if self.robots is not None and not self.robots.allowed(start_url):
+            print(f"Skipping {start_url}: disallowed by robots.txt")
+            return []
+        with span('crawl', url=start_url) as trace:
+            links, pages_done = self._crawl_pages(start_url, urlparse(start_url).netloc)
+            trace.set(pages=pages_done, links=len(links))
+
+        if not links:
+            # Statik sezgiler sonuç vermediyse tek sayfalık olağan yola (API / tarayıcı) dönülür
+            return self.scraper.extract_job_link_records(start_url)
+
+        # Aynı ilan birden çok sayfada görünebilir; metni olan kayıt tercih edilir
+        texts: Dict[str, str] = {}
+        for url, text in links:
+            if url not in texts or (text and not texts[url]):
+                texts[url] = text
+        job_links = [JobLink(url, text) for url, text in texts.items()]
+        if self.max_postings is not None:
+            job_links = job_links[:self.max_postings]
+        print(f"Crawled {pages_done} listing pages, found {len(job_links)} postings")
+        self.scraper.sync_listing(start_url, job_links, paginated=True)
+        return job_links
+
+    def _crawl_pages(self, start_url: str, host: str):
+        frontier = deque([(start_url, 0)])
+        scheduled = {start_url}
+        links: List[Tuple[str, str]] = []
+        job_urls = set()
+        pages_done = 0
+
+        executor = ThreadPoolExecutor(max_workers=max(1, self.max_concurrency))
+        crawl_page = bind(self._crawl_page)
+        try:
+            pending = {}
+            while frontier or pending:
+                while frontier and len(pending) < self.max_concurrency:
+                    url, depth = frontier.popleft()
+                    pending[executor.submit(crawl_page, url)] = (url, depth)
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, depth = pending.pop(future)
+                    pages_done += 1
+                    page_links, next_pages = future.result()
+                    for link in page_links:
+                        job_urls.add(link.url)
+                        links.append((link.url, link.text))
+
+                    if depth >= self.max_depth:
+                        continue
+                    if self.max_postings is not None and len(job_urls) >= self.max_postings:
+                        continue
+                    for next_url in next_pages:
+                        if len(scheduled) >= self.max_pages:
+                            break
+                        # Yalnızca aynı sitedeki sayfalama izlenir; ilan sayfalarının kendisi atlanır
+                        if next_url in scheduled or next_url in job_urls or urlparse(next_url).netloc != host:
+                            continue
+                        scheduled.add(next_url)
+                        frontier.append((next_url, depth + 1))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return links, pages_done
+
+    def _crawl_page(self, url: str):
+        """Fetch one listing page politely; returns (job links, next page URLs)"""
+        try:
+            delay = None
+            if self.robots is not None:
+                if not self.robots.allowed(url):
+                    print(f"Skipping {url}: disallowed by robots.txt")
+                    return [], []
+                delay = self.robots.crawl_delay(url)
+            self.throttle.wait(urlparse(url).netloc, max(delay or 0, self.per_host_delay))
+
+            page_links, _, soup = self.scraper.listing_page_links(url)
+            return page_links, find_next_pages(soup, url)
+        except Exception as e:
+            print(f"Error crawling listing page {url}: {e}")
+            return [], []
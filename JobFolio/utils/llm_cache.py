@@ -0,0 +1,76 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from utils.disk_cache import CACHE_ROOT, DiskCache
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache of LLM completions keyed by a hash of the model name and the
+    fully rendered prompt: an in-memory LRU in front of an on-disk store.
+    Both tiers honour the same TTL; the disk tier is also bounded by size.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_entries: int = 256,
+                 ttl: float = 7 * 24 * 3600, max_bytes: int = 50 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk = DiskCache(directory or os.path.join(CACHE_ROOT, "llm"), ttl=ttl, max_bytes=max_bytes)
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model_name}\0{prompt}".encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                stored_at, text = cached
+                if time.time() - stored_at < self.ttl:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return text
+                del self._memory[key]
+
+        entry = self.disk.get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, entry['stored_at'], entry['value'])
+        return entry['value']
+
+    def set(self, key: str, text: str) -> None:
+        stored_at = time.time()
+        with self._lock:
+            self._remember(key, stored_at, text)
+        self.disk.set(key, text, stored_at=stored_at)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                'hits': hits,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': hits / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory)
+            }
+
+    def _remember(self, key: str, stored_at: float, text: str) -> None:
+        self._memory[key] = (stored_at, text)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
@@ -0,0 +1,169 @@
+import math
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+
+from utils.tracing import TRACER, span
+
+
+class Components(NamedTuple):
+    scraper: object
+    email_generator: object
+    ingestor: object
+    crawler: object
+
+
+# The app and the task worker processes build their components with these
+# factories, so both read the same environment configuration.
+
+def build_scraper():
+    from utils.job_scraper import JobScraper
+    # Repeat scans of the same employer only download new or changed postings
+    return JobScraper(incremental=True)
+
+
+def build_listing_crawler(scraper):
+    from utils.listing_crawler import ListingCrawler
+    return ListingCrawler(scraper)
+
+
+def build_email_generator():
+    from utils.email_generator import EmailGenerator
+
+    # Optional: reuse emails generated for near-identical postings (requires chromadb)
+    semantic_cache = None
+    if os.getenv("JOBFOLIO_SEMANTIC_CACHE"):
+        from utils.db_manager import DBManager
+        from utils.semantic_cache import SemanticEmailCache
+        semantic_cache = SemanticEmailCache(
+            DBManager(), threshold=float(os.getenv("JOBFOLIO_SEMANTIC_THRESHOLD", "0.92"))
+        )
+    return EmailGenerator(semantic_cache=semantic_cache)
+
+
+def build_resume_ingestor():
+    from utils.resume_ingest import ResumeIngestor
+
+    # Optional: keep extracted resume text on disk across restarts (off by default: it is personal data)
+    options = {'disk_cache': os.getenv("JOBFOLIO_RESUME_DISK_CACHE", "").lower() in ("1", "true", "yes")}
+    # A worker process must not start its own process pool: the nested pool blocks interpreter exit
+    if multiprocessing.parent_process() is not None:
+        options['process_pool_min_pages'] = math.inf
+    return ResumeIngestor(**options)
+
+
+_components = None
+_components_lock = threading.Lock()
+
+
+def default_components() -> Components:
+    """Components built once per process; used by worker processes, which cannot receive the app's objects"""
+    global _components
+    with _components_lock:
+        if _components is None:
+            scraper = build_scraper()
+            _components = Components(scraper, build_email_generator(), build_resume_ingestor(),
+                                     build_listing_crawler(scraper))
+        return _components
+
+
+_profiles: "OrderedDict[tuple, object]" = OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+def resume_profile(email_generator, resume_text: str, max_entries: int = 16):
+    """Parse each distinct resume once per generator; reruns and repeated tasks reuse the profile"""
+    key = (id(email_generator), resume_text)
+    with _profiles_lock:
+        profile = _profiles.get(key)
+        if profile is not None:
+            _profiles.move_to_end(key)
+            return profile
+    profile = email_generator.build_resume_profile(resume_text)
+    with _profiles_lock:
+        _profiles[key] = profile
+        while len(_profiles) > max_entries:
+            _profiles.popitem(last=False)
+    return profile
+
+
+def _job_summary(job: Optional[Dict]) -> Optional[Dict]:
+    if not job:
+        return None
+    return {key: job.get(key) for key in ('title', 'company', 'url', 'score')}
+
+
+def run_email_pipeline(context, listing_url: str, pdf_bytes: bytes, tone: str, email_count: int = 1,
+                       follow_pagination: bool = False, regenerate: bool = False,
+                       components: Optional[Components] = None) -> Dict:
+    """
+    The whole "generate email" flow as a background task: resume extraction,
+    link extraction, matching and email generation. Progress is reported
+    through context.progress (stage, scan counts, best match so far, partial
+    emails); the result is {'jobs': [...], 'emails': [{'job', 'email', 'error',
+    'rank', 'prompt_metrics'}]} with the emails in ranking order.
+    With tracing enabled the result also carries the run's span tree as 'trace'.
+    """
+    with span('pipeline', email_count=email_count, follow_pagination=follow_pagination) as trace:
+        result = _run_email_pipeline(context, listing_url, pdf_bytes, tone, email_count, follow_pagination,
+                                     regenerate, components or default_components())
+    if TRACER.enabled:
+        result['trace'] = trace.to_dict()
+    return result
+
+
+def _run_email_pipeline(context, listing_url, pdf_bytes, tone, email_count, follow_pagination, regenerate,
+                        components: Components) -> Dict:
+    scraper, email_generator, ingestor, crawler = components
+
+    context.progress(stage='resume')
+    resume = resume_profile(email_generator, ingestor.extract_text(pdf_bytes))
+
+    context.progress(stage='links')
+    if follow_pagination:
+        job_links = crawler.crawl(listing_url)
+    else:
+        job_links = scraper.extract_job_link_records(listing_url)
+    if not job_links:
+        return {'jobs': [], 'emails': [], 'message': "No job links found on the page. Please try a different listing URL."}
+
+    top_jobs = []
+    for progress in scraper.iter_matching_jobs(job_links, resume, top_k=max(3, email_count)):
+        top_jobs = progress['ranking'][:email_count]
+        context.progress(stage='scan', fetched=progress['fetched'], total=progress['total'],
+                         best=_job_summary(top_jobs[0] if top_jobs else None))
+    if not top_jobs:
+        return {'jobs': [], 'emails': [], 'message': "Could not find a matching job based on your resume."}
+
+    context.progress(stage='email', emails=[])
+    emails = []
+    if len(top_jobs) > 1:
+        # Emails finish in any order; each result keeps its job's position in the ranking
+        ranks = {id(job): rank for rank, job in enumerate(top_jobs)}
+        for result in email_generator.generate_emails(top_jobs, resume, tone, regenerate=regenerate):
+            emails.append(dict(result, rank=ranks[id(result['job'])]))
+            context.progress(emails=_serializable(emails))
+    else:
+        # The email is published as progress while it streams; each UI poll shows the latest text
+        chunks = []
+        metrics = []
+        last_report = 0.0
+        for chunk in email_generator.stream_email(top_jobs[0], resume, tone, regenerate=regenerate,
+                                                  on_metrics=metrics.append):
+            chunks.append(chunk)
+            if time.monotonic() - last_report > 0.2:
+                context.progress(partial_email=''.join(chunks))
+                last_report = time.monotonic()
+        emails.append({'job': top_jobs[0], 'email': ''.join(chunks), 'error': None, 'rank': 0,
+                       'prompt_metrics': metrics[0] if metrics else None})
+
+    return {'jobs': top_jobs, 'emails': _serializable(emails)}
+
+
+def _serializable(emails):
+    """Results sorted by job rank, with exceptions turned into messages so they survive pickling"""
+    return [dict(result, error=str(result['error']) if result['error'] else None)
+            for result in sorted(emails, key=lambda result: result['rank'])]
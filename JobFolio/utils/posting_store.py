@@ -0,0 +1,126 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.disk_cache import CACHE_ROOT
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    url TEXT PRIMARY KEY,
+    listing TEXT,
+    link_text TEXT NOT NULL DEFAULT '',
+    content_hash TEXT,
+    details TEXT,
+    checked_at REAL NOT NULL DEFAULT 0,
+    seen_at REAL NOT NULL DEFAULT 0,
+    stale INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS postings_listing ON postings (listing);
+"""
+
+# Eski SQLite sürümleri sorgu başına 999 parametreye izin verir; IN listeleri bu boyutta parçalanır
+QUERY_CHUNK_SIZE = 500
+
+
+class PostingStore:
+    """
+    Postings seen on earlier scans, keyed by canonical URL: the listing page they
+    were found on, their anchor text, the hash of the last downloaded page, the
+    parsed details and when they were last checked. Postings that disappear from
+    their listing page are marked stale instead of being deleted.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(CACHE_ROOT, "postings.sqlite3")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Tek bağlantı, iş parçacıkları arasında kilitle paylaşılır
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.executescript(SCHEMA)
+
+    def get(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM postings WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry['details'] = json.loads(entry['details']) if entry['details'] else None
+        entry['stale'] = bool(entry['stale'])
+        return entry
+
+    def save(self, url: str, content_hash: str, details: Optional[Dict]) -> None:
+        """Store a freshly downloaded posting"""
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                INSERT INTO postings (url, content_hash, details, checked_at, seen_at, stale)
+                VALUES (?, ?, ?, ?, ?, 0)
+                ON CONFLICT(url) DO UPDATE SET
+                    content_hash = excluded.content_hash, details = excluded.details,
+                    checked_at = excluded.checked_at, stale = 0
+                """,
+                (url, content_hash, json.dumps(details, ensure_ascii=False) if details else None, now, now)
+            )
+
+    def mark_checked(self, url: str) -> None:
+        """The page was downloaded again and had not changed"""
+        with self._lock, self._connection:
+            self._connection.execute("UPDATE postings SET checked_at = ? WHERE url = ?", (time.time(), url))
+
+    def sync_listing(self, listing: str, links: Iterable[Tuple[str, str]]) -> Dict[str, int]:
+        """
+        Record the (url, anchor text) pairs currently on a listing page. Postings
+        whose anchor text changed are due for a re-check; postings of this listing
+        that are no longer present are marked stale. Returns counts per outcome.
+        """
+        now = time.time()
+        links = list(links)
+        urls = [url for url, _ in links]
+        with self._lock, self._connection:
+            known = {}
+            for start in range(0, len(urls), QUERY_CHUNK_SIZE):
+                chunk = urls[start:start + QUERY_CHUNK_SIZE]
+                known.update(
+                    (row['url'], row['link_text']) for row in self._connection.execute(
+                        f"SELECT url, link_text FROM postings WHERE url IN ({','.join('?' * len(chunk))})", chunk
+                    )
+                )
+            changed = [url for url, text in links if url in known and text and known[url] and known[url] != text]
+
+            self._connection.executemany(
+                """
+                INSERT INTO postings (url, listing, link_text, seen_at, stale) VALUES (?, ?, ?, ?, 0)
+                ON CONFLICT(url) DO UPDATE SET
+                    listing = excluded.listing, seen_at = excluded.seen_at, stale = 0,
+                    link_text = CASE WHEN excluded.link_text != '' THEN excluded.link_text ELSE link_text END
+                """,
+                [(url, listing, text or '', now) for url, text in links]
+            )
+            self._connection.executemany(
+                "UPDATE postings SET checked_at = 0 WHERE url = ?", [(url,) for url in changed]
+            )
+            stale = self._connection.execute(
+                "UPDATE postings SET stale = 1 WHERE listing = ? AND seen_at < ? AND stale = 0", (listing, now)
+            ).rowcount
+        return {
+            'new': sum(1 for url in urls if url not in known),
+            'changed': len(changed),
+            'stale': stale
+        }
+
+    def stale_postings(self, listing: str) -> List[str]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT url FROM postings WHERE listing = ? AND stale = 1 ORDER BY url", (listing,)
+            ).fetchall()
+        return [row['url'] for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
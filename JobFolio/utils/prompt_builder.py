@@ -0,0 +1,196 @@
+import importlib.util
+import math
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from utils.skill_matcher import STOPWORDS, tokenize
+
+SECTION_HEADINGS = frozenset([
+    'summary', 'professional summary', 'profile', 'about', 'about me', 'objective', 'career objective',
+    'experience', 'work experience', 'professional experience', 'employment', 'employment history',
+    'work history', 'education', 'skills', 'technical skills', 'core competencies', 'competencies',
+    'projects', 'personal projects', 'certifications', 'certificates', 'awards', 'honors', 'achievements',
+    'publications', 'languages', 'interests', 'hobbies', 'volunteer', 'volunteering', 'activities',
+    'leadership', 'courses', 'training', 'references'
+])
+
+# Sections that are relevant to almost any posting get a small head start
+PREFERRED_SECTIONS = {'summary': 1.0, 'profile': 1.0, 'experience': 2.0, 'skills': 2.0}
+
+# List items that come from menus and footers when skills fall back to every <li>
+NAVIGATION_ITEMS = frozenset([
+    'home', 'about', 'about us', 'contact', 'contact us', 'careers', 'jobs', 'blog', 'news', 'press',
+    'login', 'log in', 'sign in', 'sign up', 'register', 'search', 'menu', 'privacy', 'privacy policy',
+    'terms', 'terms of use', 'terms of service', 'cookies', 'cookie policy', 'sitemap', 'help', 'faq',
+    'support', 'english', 'back', 'next', 'previous', 'share', 'apply', 'apply now'
+])
+
+HEADING_PATTERN = re.compile(r"^[A-Za-z][A-Za-z &/-]{1,40}:?$")
+
+
+def _load_tiktoken_encoding():
+    if importlib.util.find_spec("tiktoken") is None:
+        return None
+    import tiktoken
+    return tiktoken.get_encoding("cl100k_base")
+
+
+class TokenCounter:
+    """Counts tokens with tiktoken when installed, else estimates ~4 characters per token"""
+
+    def __init__(self):
+        self._encoding = _load_tiktoken_encoding()
+
+    def __call__(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text) / 4)
+
+
+def _heading_name(line: str) -> Optional[str]:
+    stripped = line.strip()
+    if not stripped or not HEADING_PATTERN.match(stripped):
+        return None
+    name = ' '.join(stripped.rstrip(':').lower().split())
+    if name in SECTION_HEADINGS:
+        return name
+    # Short ALL CAPS lines ("TECHNICAL SKILLS") are treated as headings too
+    if stripped.isupper() and len(stripped.split()) <= 4:
+        return name
+    return None
+
+
+def split_resume_sections(resume_text: str) -> List[Tuple[str, str]]:
+    """Split a resume into (heading, text) sections; text before the first heading is 'header'"""
+    sections = []
+    heading = 'header'
+    lines = []
+    for line in resume_text.split('\n'):
+        name = _heading_name(line)
+        if name is not None:
+            if lines and any(existing.strip() for existing in lines):
+                sections.append((heading, '\n'.join(lines)))
+            heading = name
+            lines = [line]
+        else:
+            lines.append(line)
+    if lines and any(existing.strip() for existing in lines):
+        sections.append((heading, '\n'.join(lines)))
+    return sections
+
+
+class PromptBuilder:
+    """
+    Fits the email prompt into a token budget: de-duplicates and caps the posting's
+    skills (dropping navigation-like list items and cutting long requirement
+    sentences to max_skill_words) and keeps the resume sections most
+    relevant to those skills. Records tokens saved per request.
+    """
+
+    def __init__(self, max_input_tokens: int = 3000, max_skills: int = 20, max_skill_words: int = 15,
+                 token_counter=None):
+        self.max_input_tokens = max_input_tokens
+        self.max_skills = max_skills
+        self.max_skill_words = max_skill_words
+        self.count_tokens = token_counter or TokenCounter()
+        self._lock = threading.Lock()
+        self.totals = {'requests': 0, 'original_tokens': 0, 'prompt_tokens': 0, 'tokens_saved': 0}
+
+    def compact_skills(self, skills: List[str]) -> List[str]:
+        kept = []
+        seen = set()
+        for skill in skills:
+            # Long requirement sentences are cut to their opening words rather than dropped
+            text = ' '.join(skill.split()[:self.max_skill_words])
+            key = text.lower()
+            if key in seen or key in NAVIGATION_ITEMS or not any(char.isalpha() for char in text):
+                continue
+            seen.add(key)
+            kept.append(text)
+            if len(kept) >= self.max_skills:
+                break
+        return kept
+
+    def compact_resume(self, resume_text: str, skills: List[str], budget: int,
+                       sections: Optional[List[Tuple[str, str]]] = None) -> Tuple[str, int, int]:
+        """Return (resume text within budget, sections kept, sections total)"""
+        if sections is None:
+            sections = split_resume_sections(resume_text)
+        if self.count_tokens(resume_text) <= budget:
+            return resume_text, len(sections), len(sections)
+
+        skill_terms = {
+            token for skill in skills for token in tokenize(skill)
+            if token not in STOPWORDS and len(token) > 1
+        }
+
+        def relevance(item):
+            index, (heading, text) = item
+            terms = set(tokenize(text))
+            score = len(terms & skill_terms) + PREFERRED_SECTIONS.get(heading.split()[-1], 0)
+            return -score, index
+
+        costs = [self.count_tokens(text) for _, text in sections]
+        chosen = {}
+        remaining = budget
+        # The header (name and contact lines) is always kept first
+        order = [(i, section) for i, section in enumerate(sections) if section[0] == 'header']
+        order += sorted(((i, section) for i, section in enumerate(sections) if section[0] != 'header'),
+                        key=relevance)
+        for index, (_, text) in order:
+            if remaining <= 0:
+                break
+            if costs[index] <= remaining:
+                chosen[index] = text
+                remaining -= costs[index]
+            else:
+                partial = self._truncate_lines(text, remaining)
+                if partial:
+                    chosen[index] = partial
+                    remaining -= self.count_tokens(partial)
+
+        kept_text = '\n'.join(chosen[index] for index in sorted(chosen))
+        return kept_text, len(chosen), len(sections)
+
+    def build(self, template: str, inputs: Dict[str, str], skills: List[str],
+              sections: Optional[List[Tuple[str, str]]] = None) -> Tuple[Dict[str, str], Dict]:
+        """Return the compacted prompt inputs and the metrics for this request"""
+        original_tokens = self.count_tokens(template.format(**inputs))
+
+        compact_skills = self.compact_skills(skills)
+        compacted = dict(inputs, skills=", ".join(compact_skills))
+        fixed_tokens = self.count_tokens(template.format(**dict(compacted, resume="")))
+        resume_budget = max(0, self.max_input_tokens - fixed_tokens)
+        compacted['resume'], sections_kept, sections_total = self.compact_resume(
+            inputs['resume'], compact_skills, resume_budget, sections
+        )
+
+        prompt_tokens = self.count_tokens(template.format(**compacted))
+        metrics = {
+            'original_tokens': original_tokens,
+            'prompt_tokens': prompt_tokens,
+            'tokens_saved': max(0, original_tokens - prompt_tokens),
+            'skills_total': len(skills),
+            'skills_kept': len(compact_skills),
+            'sections_total': sections_total,
+            'sections_kept': sections_kept
+        }
+        with self._lock:
+            self.totals['requests'] += 1
+            for key in ('original_tokens', 'prompt_tokens', 'tokens_saved'):
+                self.totals[key] += metrics[key]
+        return compacted, metrics
+
+    def _truncate_lines(self, text: str, budget: int) -> str:
+        kept = []
+        used = 0
+        for line in text.split('\n'):
+            cost = self.count_tokens(line) + 1
+            if used + cost > budget:
+                break
+            kept.append(line)
+            used += cost
+        return '\n'.join(kept).strip()
@@ -0,0 +1,74 @@
+import math
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+from utils.skill_matcher import STOPWORDS, tokenize
+
+
+def job_document(job: Dict) -> str:
+    """Text of a posting used for ranking: title, skills, experience and education"""
+    parts = [job.get('title', '')]
+    parts.extend(job.get('primary_skills', []))
+    parts.append(job.get('experience', ''))
+    parts.append(job.get('education', ''))
+    return ' '.join(part for part in parts if part)
+
+
+def _terms(text: str) -> List[str]:
+    return [token for token in tokenize(text) if token not in STOPWORDS]
+
+
+def rank_jobs(jobs: List[Dict], resume_text: str, top_k: int = 5) -> List[Dict]:
+    """
+    Rank postings by TF-IDF cosine similarity to the resume.
+    All postings are encoded as one sparse (CSR-style) matrix and scored with a
+    single matrix-vector product. Returns copies of the top_k jobs with a 'score' key.
+    """
+    if not jobs or top_k <= 0:
+        return []
+
+    vocabulary: Dict[str, int] = {}
+    indices = []
+    counts = []
+    row_lengths = []
+    for job in jobs:
+        term_counts = Counter(_terms(job_document(job)))
+        for term, count in term_counts.items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            counts.append(count)
+        row_lengths.append(len(term_counts))
+
+    indices = np.asarray(indices, dtype=np.int64)
+    row_lengths = np.asarray(row_lengths, dtype=np.int64)
+    rows = np.repeat(np.arange(len(jobs)), row_lengths)
+
+    # Alt-doğrusal tf ve yumuşatılmış idf (ilanlar üzerinden)
+    document_frequency = np.bincount(indices, minlength=len(vocabulary))
+    idf = np.log((1 + len(jobs)) / (1 + document_frequency)) + 1
+    data = (1 + np.log(np.asarray(counts, dtype=np.float64))) * idf[indices]
+
+    row_norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=len(jobs)))
+    row_norms[row_norms == 0] = 1
+    data /= row_norms[rows]
+
+    # Özgeçmiş vektörü yalnızca ilanlarda geçen terimler üzerinden kurulur
+    resume_vector = np.zeros(len(vocabulary))
+    for term, count in Counter(_terms(resume_text)).items():
+        term_id = vocabulary.get(term)
+        if term_id is not None:
+            resume_vector[term_id] = (1 + math.log(count)) * idf[term_id]
+    resume_norm = np.linalg.norm(resume_vector)
+    if resume_norm:
+        resume_vector /= resume_norm
+
+    scores = np.bincount(rows, weights=data * resume_vector[indices], minlength=len(jobs))
+
+    order = np.argsort(-scores, kind='stable')[:top_k]
+    ranked = []
+    for i in order:
+        job = dict(jobs[i])
+        job['score'] = float(scores[i])
+        ranked.append(job)
+    return ranked
@@ -0,0 +1,120 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for HTTP 429 responses from the provider (groq / openai / httpx style errors)"""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is not None:
+        return status == 429
+    return 'rate limit' in str(error).lower()
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds from the Retry-After header of a 429 response, if present"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    value = headers.get('retry-after') or headers.get('Retry-After')
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class RateLimiter:
+    """
+    Sliding one-minute window over requests and tokens, shared by every caller
+    using the same API key. Bookkeeping is guarded by a threading lock and waits
+    use asyncio.sleep, so one limiter can serve several event loops.
+    """
+
+    def __init__(self, requests_per_minute: int = 30, tokens_per_minute: int = 6000, period: float = 60.0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.period = period
+        self._window = deque()  # (timestamp, tokens) pairs
+        self._tokens_in_window = 0
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        """Reserve capacity and return 0, or return how long to wait before trying again"""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            while self._window and now - self._window[0][0] >= self.period:
+                self._tokens_in_window -= self._window.popleft()[1]
+
+            fits_requests = len(self._window) < self.requests_per_minute
+            # A single request larger than the token limit still goes through once the window is empty
+            fits_tokens = not self._window or self._tokens_in_window + tokens <= self.tokens_per_minute
+            if fits_requests and fits_tokens:
+                self._window.append((now, tokens))
+                self._tokens_in_window += tokens
+                return 0.0
+            return max(0.01, self._window[0][0] + self.period - now)
+
+    async def acquire(self, tokens: int) -> None:
+        while True:
+            delay = self._reserve(tokens)
+            if not delay:
+                return
+            await asyncio.sleep(delay)
+
+    def acquire_blocking(self, tokens: int) -> None:
+        """acquire() for synchronous callers; sleeps the calling thread"""
+        while True:
+            delay = self._reserve(tokens)
+            if not delay:
+                return
+            time.sleep(delay)
+
+    def pause(self, delay: float) -> None:
+        """Hold back every caller for delay seconds (after a 429)"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+
+
+def backoff_delay(error: Exception, attempt: int, base_delay: float = 1.0, max_delay: float = 30.0) -> float:
+    """Wait before retry number attempt + 1: exponential backoff, never shorter than Retry-After"""
+    # Retry-After is a floor: jitter only ever adds to it, so the retry is never early
+    backoff = min(max_delay, base_delay * 2 ** attempt)
+    return max(retry_after(error) or 0.0, backoff) + random.uniform(0, backoff / 2)
+
+
+async def call_with_backoff(limiter: RateLimiter, call: Callable[[], Awaitable[T]], tokens: int,
+                            max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 30.0) -> T:
+    """Run call within the rate limits, retrying 429s with exponential backoff and jitter"""
+    for attempt in range(max_retries + 1):
+        await limiter.acquire(tokens)
+        try:
+            return await call()
+        except Exception as e:
+            if not is_rate_limit_error(e) or attempt == max_retries:
+                raise
+            delay = backoff_delay(e, attempt, base_delay, max_delay)
+            print(f"Rate limited, retrying in {delay:.1f}s")
+            limiter.pause(delay)
+
+
+def call_with_backoff_blocking(limiter: RateLimiter, call: Callable[[], T], tokens: int,
+                               max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 30.0) -> T:
+    """Synchronous call_with_backoff, for the single-email and streaming paths"""
+    for attempt in range(max_retries + 1):
+        limiter.acquire_blocking(tokens)
+        try:
+            return call()
+        except Exception as e:
+            if not is_rate_limit_error(e) or attempt == max_retries:
+                raise
+            delay = backoff_delay(e, attempt, base_delay, max_delay)
+            print(f"Rate limited, retrying in {delay:.1f}s")
+            limiter.pause(delay)
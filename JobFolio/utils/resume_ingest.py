@@ -0,0 +1,130 @@
+import atexit
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Union
+
+from utils.disk_cache import CACHE_ROOT, DiskCache
+from utils.tracing import annotate, span
+
+MAX_PDF_BYTES = 20 * 1024 * 1024
+MAX_PDF_PAGES = 60
+# Below this many pages the process pool start-up costs more than it saves
+PROCESS_POOL_MIN_PAGES = 12
+
+
+class ResumeTooLarge(ValueError):
+    """The uploaded PDF exceeds the configured page or byte limit"""
+
+
+def _extract_page_range(data: bytes, start: int, end: int) -> List[str]:
+    """Text of pages [start, end); top level so process pool workers can run it"""
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def default_workers() -> int:
+    return min(4, os.cpu_count() or 1)
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Process pool shared by every ingestor in this process, created on first large PDF"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=default_workers())
+        return _process_pool
+
+
+@atexit.register
+def _shutdown_process_pool():
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ResumeIngestor:
+    """
+    Turns an uploaded resume PDF into text. Results are cached by the SHA-256 of
+    the file content in a memory LRU, so uploading the same file again or
+    clicking the button again skips extraction. Extracted text is personal data,
+    so it is only written to disk (for disk_ttl seconds) when disk_cache is set.
+    Large documents are split into page ranges and extracted in a process pool.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_pages: int = MAX_PDF_PAGES,
+                 max_bytes: int = MAX_PDF_BYTES, process_pool_min_pages: float = PROCESS_POOL_MIN_PAGES,
+                 memory_entries: int = 32, disk_cache: bool = False, disk_ttl: float = 24 * 3600):
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.process_pool_min_pages = process_pool_min_pages
+        self.memory_entries = memory_entries
+        self.disk = DiskCache(cache_dir or os.path.join(CACHE_ROOT, "resumes"),
+                              ttl=disk_ttl, max_bytes=50 * 1024 * 1024) if disk_cache else None
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def extract_text(self, upload: Union[bytes, io.IOBase]) -> str:
+        """Text of a PDF given as bytes or a file-like object (e.g. Streamlit's UploadedFile)"""
+        data = self._read(upload)
+        key = hashlib.sha256(data).hexdigest()
+
+        with span('pdf_extract', bytes=len(data)) as trace:
+            with self._lock:
+                text = self._memory.get(key)
+                if text is not None:
+                    self._memory.move_to_end(key)
+                    trace.set(cache='memory', cache_hit=True)
+                    return text
+
+            entry = self.disk.get(key) if self.disk is not None else None
+            trace.set(cache='disk' if entry is not None else 'miss', cache_hit=entry is not None)
+            text = entry['value'] if entry is not None else self._extract(data)
+            if entry is None and self.disk is not None:
+                self.disk.set(key, text)
+            with self._lock:
+                self._memory[key] = text
+                while len(self._memory) > self.memory_entries:
+                    self._memory.popitem(last=False)
+            return text
+
+    def _read(self, upload) -> bytes:
+        if isinstance(upload, (bytes, bytearray)):
+            data = bytes(upload)
+        else:
+            if hasattr(upload, 'seek'):
+                upload.seek(0)
+            # Read at most one byte past the limit instead of the whole stream
+            data = upload.read(self.max_bytes + 1)
+        if len(data) > self.max_bytes:
+            raise ResumeTooLarge(f"Resume PDF is larger than {self.max_bytes / (1024 * 1024):.1f} MB")
+        return data
+
+    def _extract(self, data: bytes) -> str:
+        import PyPDF2
+
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+        page_count = len(reader.pages)
+        if page_count > self.max_pages:
+            raise ResumeTooLarge(f"Resume PDF has {page_count} pages; the limit is {self.max_pages}")
+        annotate(pages=page_count)
+
+        if page_count < self.process_pool_min_pages or default_workers() < 2:
+            return "".join(page.extract_text() or "" for page in reader.pages)
+
+        # Each worker parses its own copy of the PDF and extracts a contiguous page range
+        pool = get_process_pool()
+        step = -(-page_count // default_workers())
+        futures = [
+            pool.submit(_extract_page_range, data, start, min(start + step, page_count))
+            for start in range(0, page_count, step)
+        ]
+        return "".join(text for future in futures for text in future.result())
@@ -0,0 +1,48 @@
+import hashlib
+from typing import Dict, List, Optional, Tuple, Union
+
+from utils.prompt_builder import split_resume_sections
+from utils.skill_matcher import ResumeIndex, build_resume_index
+
+
+def resume_fingerprint(resume: Union[str, 'ResumeProfile']) -> str:
+    """SHA-256 of the whitespace-normalized resume text; a profile's is computed once"""
+    if isinstance(resume, ResumeProfile):
+        return resume.fingerprint
+    return hashlib.sha256(' '.join(resume.split()).encode('utf-8')).hexdigest()
+
+
+class ResumeProfile:
+    """
+    Everything derived from one resume, computed once per upload and shared by
+    job matching and email generation: the whitespace-normalized lowercase text,
+    the text fingerprint (semantic cache key), the token index, the section boundaries and (when built by EmailGenerator)
+    contact details.
+    """
+
+    def __init__(self, text: str, contact_details: Optional[Dict[str, Optional[str]]] = None):
+        self.text = text
+        self.normalized_text = ' '.join(text.split()).lower()
+        self.fingerprint = resume_fingerprint(text)
+        self.index = build_resume_index(text)
+        self.sections: List[Tuple[str, str]] = split_resume_sections(text)
+        self.contact_details = contact_details
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.contact_details.get('name') if self.contact_details else None
+
+    def __repr__(self):
+        return f"ResumeProfile(name={self.name!r}, sections={[heading for heading, _ in self.sections]})"
+
+
+def resume_text_of(resume: Union[str, ResumeProfile]) -> str:
+    return resume.text if isinstance(resume, ResumeProfile) else resume
+
+
+def resume_index_of(resume: Union[str, ResumeProfile, ResumeIndex]) -> ResumeIndex:
+    if isinstance(resume, ResumeIndex):
+        return resume
+    if isinstance(resume, ResumeProfile):
+        return resume.index
+    return build_resume_index(resume)
@@ -0,0 +1,83 @@
+import hashlib
+import threading
+
+from utils.resume_profile import resume_fingerprint
+
+
+class SemanticEmailCache:
+    """
+    Reuses a previously generated email when the same resume and tone were
+    already used for a near-identical posting (e.g. the same role in another
+    city). Postings are compared by embedding a job signature through
+    DBManager; the resume and tone must match exactly.
+    """
+
+    def __init__(self, db_manager, threshold=0.92, max_skills=15):
+        self.db_manager = db_manager
+        self.threshold = threshold
+        self.max_skills = max_skills
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def job_signature(self, job_details):
+        skills = ", ".join(job_details.get('primary_skills', [])[:self.max_skills])
+        return (
+            f"Job Title: {job_details.get('title', '')}\n"
+            f"Company: {job_details.get('company', '')}\n"
+            f"Required Skills: {skills}\n"
+            f"Required Experience: {job_details.get('experience', '')}"
+        )
+
+    @staticmethod
+    def resume_fingerprint(resume):
+        """resume may be text or a ResumeProfile, whose precomputed fingerprint is reused"""
+        return resume_fingerprint(resume)
+
+    def lookup(self, job_details, resume, tone):
+        """Return an adapted stored email for a near-identical posting, or None"""
+        where = {"$and": [{"resume": self.resume_fingerprint(resume)}, {"tone": tone}]}
+        try:
+            match = self.db_manager.find_similar_generation(
+                self.job_signature(job_details), where=where, min_similarity=self.threshold
+            )
+        except Exception as e:
+            print(f"Semantic cache lookup failed: {e}")
+            match = None
+
+        with self._lock:
+            if match is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return self.adapt(match['email'], match['metadata'], job_details)
+
+    def store(self, job_details, resume, tone, email):
+        signature = self.job_signature(job_details)
+        resume = self.resume_fingerprint(resume)
+        generation_id = hashlib.sha256(f"{resume}\0{tone}\0{signature}".encode('utf-8')).hexdigest()
+        metadata = {
+            "resume": resume,
+            "tone": tone,
+            "job_title": job_details.get('title', ''),
+            "company": job_details.get('company', ''),
+            "location": job_details.get('location', '')
+        }
+        try:
+            self.db_manager.store_generation(generation_id, signature, email, metadata)
+        except Exception as e:
+            print(f"Semantic cache store failed: {e}")
+
+    @staticmethod
+    def adapt(email, stored, job_details):
+        """Swap the stored posting's title, company and location for the new posting's"""
+        for key, new_key in (("job_title", "title"), ("company", "company"), ("location", "location")):
+            old_value = stored.get(key) or ''
+            new_value = job_details.get(new_key) or ''
+            if old_value and new_value and old_value != new_value:
+                email = email.replace(old_value, new_value)
+        return email
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
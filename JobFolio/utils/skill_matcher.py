@@ -0,0 +1,73 @@
+import re
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+# "c++", "c#", "node.js", "asp.net" gibi teknoloji adları tek token olarak kalır
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+# Tek harfli olsa da anlamlı olan beceri adları
+SHORT_SKILLS = frozenset(['c', 'r'])
+
+STOPWORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'is', 'it',
+    'its', 'of', 'on', 'or', 'our', 'the', 'to', 'we', 'will', 'with', 'you', 'your', 'able', 'ability',
+    'strong', 'good', 'excellent', 'knowledge', 'experience', 'experienced', 'skills', 'skill', 'years',
+    'year', 'plus', 'etc', 'e.g', 'i.e', 'including', 'other', 'such', 'using', 'work', 'working'
+])
+
+# Tam ifade eşleşmesi 1 puan; yalnızca kelimelerin bir kısmı bulunursa en fazla bu kadar
+PARTIAL_MATCH_WEIGHT = 0.8
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+@lru_cache(maxsize=4096)
+def _skill_terms(skill: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Return (all tokens, content tokens) of a skill phrase; cached since postings share phrases"""
+    tokens = tuple(tokenize(skill))
+    terms = tuple(dict.fromkeys(
+        token for token in tokens
+        if token not in STOPWORDS and (len(token) > 1 or token in SHORT_SKILLS)
+    ))
+    return tokens, terms
+
+
+class ResumeIndex:
+    """
+    Token and n-gram sets built once from a resume, so each skill lookup is a
+    hash probe instead of a substring scan over the whole text.
+    """
+
+    def __init__(self, resume_text: str, max_ngram: int = 3):
+        self.max_ngram = max_ngram
+        tokens = tokenize(resume_text)
+        self.tokens = frozenset(tokens)
+        ngrams = set()
+        for n in range(2, max_ngram + 1):
+            for i in range(len(tokens) - n + 1):
+                ngrams.add(' '.join(tokens[i:i + n]))
+        self.ngrams = frozenset(ngrams)
+
+    def score_skill(self, skill: str) -> float:
+        tokens, terms = _skill_terms(skill)
+        if not terms:
+            return 0.0
+
+        if len(tokens) == 1:
+            return 1.0 if tokens[0] in self.tokens else 0.0
+        if len(tokens) <= self.max_ngram and ' '.join(tokens) in self.ngrams:
+            return 1.0
+
+        hits = sum(1 for term in terms if term in self.tokens)
+        return PARTIAL_MATCH_WEIGHT * hits / len(terms)
+
+    def score(self, skills: Iterable[str]) -> float:
+        return sum(self.score_skill(skill) for skill in skills)
+
+
+@lru_cache(maxsize=16)
+def build_resume_index(resume_text: str) -> ResumeIndex:
+    """Build (or reuse) the index for a resume; repeated scans with the same text share it"""
+    return ResumeIndex(resume_text)
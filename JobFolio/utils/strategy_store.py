@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+from utils.disk_cache import CACHE_ROOT
+
+STATIC = 'static'
+BROWSER = 'browser'
+STRUCTURED = 'structured'
+
+
+class DomainStrategyStore:
+    """
+    Remembers, per careers domain, which link-extraction strategy (static HTML,
+    headless browser or a structured-data endpoint) and which link heuristic
+    worked last time. Entries expire after `ttl` seconds and are dropped as soon
+    as they stop producing links, so the domain is probed again.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 7 * 24 * 3600):
+        self.path = path or os.path.join(CACHE_ROOT, "strategies.json")
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._strategies = self._load()
+
+    def get(self, domain: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._strategies.get(domain)
+            if entry and time.time() - entry.get('learned_at', 0) < self.ttl:
+                return dict(entry)
+            return None
+
+    def remember(self, domain: str, strategy: str, heuristic: str) -> None:
+        with self._lock:
+            previous = self._strategies.get(domain)
+            if previous and previous['strategy'] == strategy and previous['heuristic'] == heuristic \
+                    and time.time() - previous.get('learned_at', 0) < self.ttl / 2:
+                return
+            self._strategies[domain] = {
+                'strategy': strategy,
+                'heuristic': heuristic,
+                'learned_at': time.time()
+            }
+            self._save()
+
+    def forget(self, domain: str) -> None:
+        with self._lock:
+            if self._strategies.pop(domain, None) is not None:
+                self._save()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._strategies, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not save domain strategies: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,184 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED_STATES = frozenset([DONE, FAILED, CANCELLED])
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task at its next progress report after cancel() was called"""
+
+
+class TaskContext:
+    """
+    Handed to every task function as its first argument. The task reports
+    progress through it, and that is also where a cancellation is noticed.
+    `state` is a plain dict for threads or a manager dict shared with a worker process.
+    """
+
+    def __init__(self, task_id: str, state):
+        self.task_id = task_id
+        self._state = state
+
+    @property
+    def cancelled(self) -> bool:
+        return bool(self._state.get('cancelled'))
+
+    def progress(self, **info) -> None:
+        """Merge info into the task's progress dict; raises TaskCancelled if the task was cancelled"""
+        if self.cancelled:
+            raise TaskCancelled(self.task_id)
+        self._state['progress'] = dict(self._state.get('progress') or {}, **info)
+
+
+def _run_task(func: Callable, context: TaskContext, args, kwargs):
+    """Runs in the worker (thread or process); top level so process pools can pickle it"""
+    if context.cancelled:
+        raise TaskCancelled(context.task_id)
+    context._state['status'] = RUNNING
+    context._state['started_at'] = time.time()
+    return func(context, *args, **kwargs)
+
+
+class ThreadBackend:
+    """Runs tasks on a thread pool inside the server process"""
+
+    def __init__(self, max_workers: int = 4):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='jobfolio-task')
+
+    def new_state(self):
+        return {}
+
+    def submit(self, func, context, args, kwargs):
+        return self.executor.submit(_run_task, func, context, args, kwargs)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ProcessBackend:
+    """
+    Runs tasks in worker processes so CPU-bound work uses several cores. Task
+    functions and their arguments must be picklable (top-level functions, plain
+    data); progress and cancellation travel through a multiprocessing manager.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        import multiprocessing
+
+        self.manager = multiprocessing.Manager()
+        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+
+    def new_state(self):
+        return self.manager.dict()
+
+    def submit(self, func, context, args, kwargs):
+        return self.executor.submit(_run_task, func, context, args, kwargs)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.manager.shutdown()
+
+
+class TaskQueue:
+    """
+    Submits long-running work (scans, email generation) to a backend and lets the
+    UI poll it by task id instead of blocking the Streamlit script. Finished
+    tasks keep their result for result_ttl seconds.
+    """
+
+    def __init__(self, backend=None, result_ttl: float = 15 * 60):
+        self.backend = backend or ThreadBackend()
+        self.result_ttl = result_ttl
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable, *args, task_id: Optional[str] = None, **kwargs) -> str:
+        """Run func(context, *args, **kwargs) in the background and return its task id"""
+        self._expire()
+        task_id = task_id or uuid.uuid4().hex
+        state = self.backend.new_state()
+        state.update({'status': PENDING, 'progress': {}, 'cancelled': False, 'submitted_at': time.time()})
+        context = TaskContext(task_id, state)
+        with self._lock:
+            if task_id in self._tasks and self._tasks[task_id]['state']['status'] not in FINISHED_STATES:
+                raise ValueError(f"Task {task_id} is already running")
+            task = {'state': state, 'future': None, 'result': None, 'error': None, 'finished_at': None}
+            self._tasks[task_id] = task
+        task['future'] = future = self.backend.submit(func, context, args, kwargs)
+        future.add_done_callback(lambda done: self._finish(task_id, task, done))
+        return task_id
+
+    def status(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot {'id', 'status', 'progress', 'result', 'error', ...} of a task, or None if unknown/expired"""
+        self._expire()
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                return None
+            state = dict(task['state'])
+            return {
+                'id': task_id,
+                'status': state['status'],
+                'progress': dict(state.get('progress') or {}),
+                'result': task['result'],
+                'error': task['error'],
+                'submitted_at': state.get('submitted_at'),
+                'started_at': state.get('started_at'),
+                'finished_at': task['finished_at']
+            }
+
+    def cancel(self, task_id: str) -> bool:
+        """Cancel a pending task outright, or ask a running one to stop at its next progress report"""
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None or task['state']['status'] in FINISHED_STATES:
+                return False
+            task['state']['cancelled'] = True
+            future = task['future']
+        if future is not None:
+            future.cancel()
+        return True
+
+    def _finish(self, task_id: str, task: Dict[str, Any], future) -> None:
+        with self._lock:
+            if future.cancelled():
+                status, result, error = CANCELLED, None, None
+            else:
+                error = future.exception()
+                result = None if error else future.result()
+                if isinstance(error, TaskCancelled):
+                    status, error = CANCELLED, None
+                else:
+                    status = FAILED if error else DONE
+            try:
+                task['state']['status'] = status
+            except Exception:
+                # Süreç yöneticisi kapandıysa durum yine de yerel kopyada tutulur
+                task['state'] = {'status': status, 'progress': {}}
+            task['result'] = result
+            task['error'] = error
+            task['finished_at'] = time.time()
+            if error is not None:
+                print(f"Task {task_id} failed: {error}")
+
+    def _expire(self) -> None:
+        now = time.time()
+        with self._lock:
+            expired = [
+                task_id for task_id, task in self._tasks.items()
+                if task['finished_at'] is not None and now - task['finished_at'] > self.result_ttl
+            ]
+            for task_id in expired:
+                del self._tasks[task_id]
+
+    def shutdown(self) -> None:
+        self.backend.shutdown()
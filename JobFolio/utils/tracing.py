@@ -0,0 +1,299 @@
+import contextvars
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+# Histogram bucket upper bounds in seconds
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# String attributes with few distinct values are exported as labels; all others stay in traces only
+LABEL_ATTRIBUTES = frozenset(['strategy', 'cache', 'outcome', 'kind', 'mode', 'error'])
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar('jobfolio_span', default=None)
+
+
+class Span:
+    """One timed stage. Numeric attributes are summed into counters when the span ends."""
+
+    __slots__ = ('tracer', 'name', 'attributes', 'trace_id', 'span_id', 'parent', 'children',
+                 'start', 'end', '_token', '_started_at')
+
+    def __init__(self, tracer, name: str, attributes: Dict[str, Any], parent: Optional['Span']):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent is not None else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.children: List[Span] = []
+        self.start = self.end = None
+        self._token = None
+        self._started_at = None
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def add(self, key: str, amount: float = 1) -> None:
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.end is None else self.end - self.start
+
+    def __enter__(self):
+        self._started_at = time.time()
+        self.start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        if exc_type is not None:
+            self.attributes['error'] = exc_type.__name__
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # A generator closed from another context (e.g. garbage-collected elsewhere)
+            pass
+        self.tracer._finish(self)
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'started_at': self._started_at,
+            'duration_ms': None if self.end is None else round(self.duration * 1000, 3),
+            'attributes': dict(self.attributes),
+            'children': [child.to_dict() for child in list(self.children)]
+        }
+
+
+class _NoopSpan:
+    """Returned while tracing is disabled: every operation does nothing"""
+
+    __slots__ = ()
+
+    def set(self, **attributes) -> None:
+        pass
+
+    def add(self, key: str, amount: float = 1) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _Stage:
+    __slots__ = ('count', 'total', 'buckets', 'counters', 'labels')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.counters: Dict[str, float] = {}
+        self.labels: Dict[tuple, int] = {}
+
+
+class Tracer:
+    """
+    Collects spans: finished root spans are kept as traces (the last max_traces)
+    and every span feeds per-stage duration histograms and counters that can be
+    exported as Prometheus text. Disabled tracers hand out a shared no-op span.
+    """
+
+    def __init__(self, enabled: bool = False, max_traces: int = 50, metrics_path: Optional[str] = None):
+        self.enabled = enabled
+        self.metrics_path = metrics_path
+        self._traces = deque(maxlen=max_traces)
+        self._stages: Dict[str, _Stage] = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **attributes):
+        if not self.enabled:
+            return NOOP_SPAN
+        parent = _current_span.get()
+        span = Span(self, name, attributes, parent)
+        if parent is not None:
+            parent.children.append(span)
+        return span
+
+    def _finish(self, span: Span) -> None:
+        duration = span.duration
+        with self._lock:
+            stage = self._stages.get(span.name)
+            if stage is None:
+                stage = self._stages[span.name] = _Stage()
+            stage.count += 1
+            stage.total += duration
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    stage.buckets[i] += 1
+            for key, value in span.attributes.items():
+                if isinstance(value, bool):
+                    stage.counters[key] = stage.counters.get(key, 0) + int(value)
+                elif isinstance(value, (int, float)):
+                    stage.counters[key] = stage.counters.get(key, 0) + value
+                elif key in LABEL_ATTRIBUTES and isinstance(value, str):
+                    stage.labels[(key, value)] = stage.labels.get((key, value), 0) + 1
+            if span.parent is None:
+                self._traces.append(span)
+        if span.parent is None and self.metrics_path:
+            self.write_metrics(self.metrics_path)
+
+    def traces(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Finished traces as nested dicts, newest last"""
+        with self._lock:
+            spans = list(self._traces)
+        if limit is not None:
+            spans = spans[-limit:]
+        return [span.to_dict() for span in spans]
+
+    def export_json(self, limit: Optional[int] = None) -> str:
+        return json.dumps(self.traces(limit), indent=2, ensure_ascii=False)
+
+    def export_prometheus(self) -> str:
+        with self._lock:
+            stages = {name: stage for name, stage in sorted(self._stages.items())}
+            lines = [
+                "# HELP jobfolio_stage_duration_seconds Time spent per pipeline stage",
+                "# TYPE jobfolio_stage_duration_seconds histogram"
+            ]
+            for name, stage in stages.items():
+                for bound, count in zip(DURATION_BUCKETS, stage.buckets):
+                    lines.append(f'jobfolio_stage_duration_seconds_bucket{{stage="{name}",le="{bound}"}} {count}')
+                lines.append(f'jobfolio_stage_duration_seconds_bucket{{stage="{name}",le="+Inf"}} {stage.count}')
+                lines.append(f'jobfolio_stage_duration_seconds_sum{{stage="{name}"}} {stage.total:.6f}')
+                lines.append(f'jobfolio_stage_duration_seconds_count{{stage="{name}"}} {stage.count}')
+
+            counter_names = sorted({key for stage in stages.values() for key in stage.counters})
+            for key in counter_names:
+                metric = f"jobfolio_stage_{_metric_name(key)}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for name, stage in stages.items():
+                    if key in stage.counters:
+                        lines.append(f'{metric}{{stage="{name}"}} {stage.counters[key]:g}')
+
+            if any(stage.labels for stage in stages.values()):
+                lines.append("# TYPE jobfolio_stage_outcomes_total counter")
+                for name, stage in stages.items():
+                    for (key, value), count in sorted(stage.labels.items()):
+                        lines.append(f'jobfolio_stage_outcomes_total{{stage="{name}",{key}="{_escape(value)}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write_metrics(self, path: str) -> None:
+        directory = os.path.dirname(os.path.abspath(path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.export_prometheus())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not write metrics: {e}")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._traces.clear()
+            self._stages.clear()
+
+
+def stage_summary(trace: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Per-stage totals of one trace dict, slowest first. Nested and concurrent
+    spans overlap, so the totals can add up to more than the trace's wall time.
+    """
+    stages: Dict[str, Dict[str, Any]] = {}
+    stack = [trace]
+    while stack:
+        node = stack.pop()
+        stack.extend(node.get('children', []))
+        stage = stages.setdefault(node['name'], {'stage': node['name'], 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        duration = node.get('duration_ms') or 0.0
+        stage['count'] += 1
+        stage['total_ms'] = round(stage['total_ms'] + duration, 3)
+        stage['max_ms'] = max(stage['max_ms'], duration)
+        for key in ('bytes', 'cache_hit', 'prompt_tokens', 'completion_tokens', 'tokens_saved'):
+            value = node.get('attributes', {}).get(key)
+            if isinstance(value, (int, float)):
+                stage[key] = stage.get(key, 0) + int(value)
+    return sorted(stages.values(), key=lambda stage: stage['total_ms'], reverse=True)
+
+
+def _metric_name(key: str) -> str:
+    return ''.join(char if char.isalnum() else '_' for char in key.lower())
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# JOBFOLIO_TRACING=1 turns tracing on; JOBFOLIO_METRICS_FILE also writes Prometheus text after every trace
+TRACER = Tracer(
+    enabled=os.getenv("JOBFOLIO_TRACING", "").lower() in ("1", "true", "yes"),
+    metrics_path=os.getenv("JOBFOLIO_METRICS_FILE") or None
+)
+
+
+def span(name: str, **attributes):
+    """Time a stage: `with span('fetch', url=url) as s: ...; s.set(bytes=n)`"""
+    return TRACER.span(name, **attributes)
+
+
+def current_span():
+    return _current_span.get()
+
+
+def annotate(**attributes) -> None:
+    """Set attributes on the current span, if there is one"""
+    if TRACER.enabled:
+        current = _current_span.get()
+        if current is not None:
+            current.set(**attributes)
+
+
+def use_span(parent):
+    """Make parent the current span in another thread or task, so new spans attach to its trace"""
+    return _UseSpan(parent)
+
+
+class _UseSpan:
+    __slots__ = ('parent', '_token')
+
+    def __init__(self, parent):
+        self.parent = parent
+        self._token = None
+
+    def __enter__(self):
+        if self.parent is not None:
+            self._token = _current_span.set(self.parent)
+        return self.parent
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._token is not None:
+            _current_span.reset(self._token)
+        return False
+
+
+def bind(func: Callable) -> Callable:
+    """Wrap func so spans it opens on a pool thread join the current trace; func itself when tracing is off"""
+    parent = _current_span.get() if TRACER.enabled else None
+    if parent is None:
+        return func
+
+    def run(*args, **kwargs):
+        with use_span(parent):
+            return func(*args, **kwargs)
+    return run